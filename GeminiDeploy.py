@@ -1,189 +1,103 @@
 # Deployment ready - you have to add your API key through text box
 import streamlit as st
-import google.generativeai as genai
-import json
-from datetime import datetime
 import os
 from typing import Dict
-import re
+import uuid
 from dotenv import load_dotenv
-
-def validate_api_key(api_key: str) -> bool:
-    """Validate the Gemini API key by attempting to configure and make a simple call"""
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
-        # Make a simple test call
-        response = model.generate_content("Test")
-        return True
-    except Exception as e:
-        return False
+import clients
+from clients import validate_api_key
+from checkpoint import CheckpointLog, take_mark, turn_delta
+from llm_cache import get_llm_cache
+from metrics import get_metrics
+from token_ledger import MeteredModel, get_token_ledger
+from jobs import DONE, FAILED, get_job_queue
+from extraction import fast_path_stats
+from interview import BUDGET_MODEL, InterviewSession
+
+# Render assistant replies token by token instead of after the full generation
+STREAM_REPLIES = os.getenv("TALENTSCOUT_STREAM_REPLIES", "1") == "1"
+
+def get_model(model_name: str = clients.DEFAULT_MODEL):
+    """Shared model for the API key configured in this session, metered into the token ledger"""
+    return MeteredModel(clients.get_model(st.session_state.api_key, model_name), get_token_ledger(), get_checkpoint_log().session_id)
+
+def new_interview() -> InterviewSession:
+    """Interview engine for this browser session"""
+    return InterviewSession(
+        get_model(),
+        get_checkpoint_log().session_id,
+        stream=STREAM_REPLIES,
+        ledger=get_token_ledger(),
+        budget_model=get_model(BUDGET_MODEL) if BUDGET_MODEL else None,
+    )
 
 def init_session_state():
     """Initialize session state variables"""
     if "api_key_configured" not in st.session_state:
         st.session_state.api_key_configured = False
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
-    if "chat" not in st.session_state:
-        st.session_state.chat = None
-    if "candidate_data" not in st.session_state:
-        st.session_state.candidate_data = {
-            "name": "",
-            "email": "",
-            "phone": "",
-            "experience": "",
-            "position": "",
-            "location": "",
-            "tech_stack": [],
-            "interview": {
-                "questions": [],
-                "answers": []
-            },
-            "evaluation_summary": ""
-        }
-    if "interview_complete" not in st.session_state:
-        st.session_state.interview_complete = False
-
-def extract_candidate_info(response: str, current_data: Dict) -> Dict:
-    """Extract candidate information from conversation using AI"""
-    extraction_prompt = f"""
-    From this conversation message, extract the following information if present:
-    1. Name
-    2. Email
-    3. Phone
-    4. Years of experience
-    5. Position/role they're applying for
-    6. Location
-    7. Tech stack/skills mentioned
-
-    Current data: {json.dumps(current_data)}
-    Message: {response}
-
-    Return only a JSON object with any new information found. If a field isn't found in the message, don't include it in the JSON.
-    """
-    
-    try:
-        response = model.generate_content(extraction_prompt)
-        new_info = json.loads(response.text)
-        
-        # Update current data with new information
-        for key, value in new_info.items():
-            if value and not current_data.get(key):  # Only update if new value exists and current is empty
-                if key == "tech_stack" and isinstance(value, str):
-                    current_data[key] = [tech.strip() for tech in value.split(",")]
-                else:
-                    current_data[key] = value
-        
-        return current_data
-    except Exception as e:
-        st.error(f"Error extracting candidate info: {str(e)}")
-        return current_data
-
-def generate_evaluation_summary(candidate_data: Dict) -> str:
-    """Generate an AI evaluation summary of the candidate"""
-    if not candidate_data["experience"] or not candidate_data["tech_stack"]:
-        return ""
-        
-    evaluation_prompt = f"""
-    Evaluate the candidate based on:
-    
-    Background:
-    - Experience: {candidate_data['experience']}
-    - Position: {candidate_data['position']}
-    - Tech Stack: {', '.join(candidate_data['tech_stack']) if isinstance(candidate_data['tech_stack'], list) else candidate_data['tech_stack']}
-    
-    Interview Performance:
-    Questions and Answers:
-    {json.dumps(dict(zip(candidate_data['interview']['questions'], candidate_data['interview']['answers'])), indent=2)}
-
-    Provide a SINGLE LINE evaluation summary (maximum 100 characters) that assesses:
-    1. Experience relevance
-    2. Technical knowledge
-    3. Overall suitability
-    
-    Format: Return only the evaluation summary, nothing else.
-    """
-    
-    try:
-        response = model.generate_content(evaluation_prompt)
-        return response.text.strip()
-    except Exception as e:
-        st.error(f"Error generating evaluation summary: {str(e)}")
-        return ""
-
-def save_candidate_data(data: Dict):
-    """Save candidate data to a JSON file with evaluation"""
-    try:
-        # Clean data
-        cleaned_data = data.copy()
-        for key in cleaned_data:
-            if cleaned_data[key] is None:
-                cleaned_data[key] = "" if key != "tech_stack" else []
-        
-        # Generate evaluation summary if needed
-        if not cleaned_data["evaluation_summary"]:
-            cleaned_data["evaluation_summary"] = generate_evaluation_summary(cleaned_data)
-        
-        # Create timestamp and filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        name_part = cleaned_data['name'].replace(' ', '_') if cleaned_data['name'] else cleaned_data['email'].split('@')[0] if cleaned_data['email'] else 'unnamed'
-        filename = f"{name_part}_{timestamp}_interview.json"
-        filename = ''.join(c for c in filename if c.isalnum() or c in ['_', '-', '.'])
-        
-        # Ensure directory exists
-        os.makedirs("candidates", exist_ok=True)
-        
-        filepath = os.path.join("candidates", filename)
-        
-        # Save JSON
-        with open(filepath, 'w') as f:
-            json.dump(cleaned_data, f, indent=4)
-            
-        st.success(f"Interview data saved successfully to {filename}")
-    except Exception as e:
-        st.error(f"Error saving candidate data: {str(e)}")
-
-def extract_tech_questions(response: str) -> list:
-    """Extract technical questions from AI response"""
-    questions = re.findall(r'\d+\.\s*(.*?)(?=\d+\.|$)', response, re.DOTALL)
-    return [q.strip() for q in questions if q.strip() and '?' in q]
-
-def get_initial_prompt() -> str:
-    return """You are an AI Hiring Assistant for TalentScout, a technology recruitment agency. Your name is Ash. You conduct initial screening interviews with candidates in a friendly, conversational manner. Your personality traits:
-
-1. Professional yet warm and approachable
-2. Patient and understanding
-3. Clear communicator
-4. Able to keep conversations on track while being natural
-
-Your goals during the conversation:
-1. Collect candidate information: name, email, phone, experience, desired position, location, and tech stack
-2. Ask relevant technical questions based on their tech stack
-3. Maintain a natural conversation flow while gathering required information
-4. Answer any questions about the company or process
-5. Keep technical questions simple and straightforward
-
-Important rules:
-1. Stay in character as Alex the hiring assistant
-2. When asking technical questions, always number them (1., 2., 3.)
-3. Maintain context and remember information shared
-4. If you detect an email or phone number in responses, validate their format
-5. Generate 3 basic technical questions based on their tech stack when appropriate
-6. After collecting all technical responses, indicate "INTERVIEW COMPLETE" in your response
-7. Make sure to collect specific years of experience and clear position title
-
-Always be conversational and natural, while subtly guiding the conversation to gather required information.
-
-Begin by introducing yourself and asking for the candidate's name."""
-
-def validate_email(email: str) -> bool:
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
-
-def validate_phone(phone: str) -> bool:
-    pattern = r'^\+?1?\d{9,15}$'
-    return bool(re.match(pattern, phone))
+    if "save_job" not in st.session_state:
+        st.session_state.save_job = None
+    if "save_result" not in st.session_state:
+        st.session_state.save_result = None
+
+def get_checkpoint_log() -> CheckpointLog:
+    """Checkpoint log for this interview, keyed by the session query parameter"""
+    if "checkpoint" not in st.session_state:
+        try:
+            st.session_state.checkpoint = CheckpointLog(st.query_params.get("session", ""))
+        except ValueError:
+            st.session_state.checkpoint = CheckpointLog(uuid.uuid4().hex)
+        st.query_params["session"] = st.session_state.checkpoint.session_id
+    return st.session_state.checkpoint
+
+def resume_session():
+    """Restore an unfinished interview from this session's checkpoint log"""
+    state = get_checkpoint_log().load()
+    if state["messages"]:
+        interview = st.session_state.interview
+        interview.restore(state["messages"], state["candidate_data"], state["interview_complete"], state["save_job"])
+        st.session_state.save_job = interview.save_job
+        if interview.save_job != state["save_job"]:
+            # The save was lost with the old process and queued again
+            checkpoint_turn(take_mark(interview.candidate_data), [])
+
+def checkpoint_turn(mark: Dict, messages: list):
+    """Append this turn's delta to the checkpoint log, compacting it now and then"""
+    interview = st.session_state.interview
+    log = get_checkpoint_log()
+    log.append(turn_delta(mark, interview.candidate_data, [message.to_dict() for message in messages],
+                          interview.interview_complete, interview.save_job))
+    log.maybe_compact(interview.state)
+
+def show_save_result(job: Dict):
+    if job["status"] == DONE:
+        st.success(f"Interview data saved successfully to {job['result']}")
+        if job["error"]:
+            st.warning(job["error"])
+    elif job["status"] == FAILED:
+        st.error(f"Error saving candidate data: {job['error']}")
+
+@st.fragment(run_every=2)
+def poll_save_status():
+    """Poll the background evaluation and save job for this interview until it ends"""
+    job = get_job_queue().status(st.session_state.save_job)
+    if job is None:
+        # The job queue lost it, queue the save again and keep polling
+        interview = st.session_state.interview
+        st.session_state.save_job = interview.submit()
+        checkpoint_turn(take_mark(interview.candidate_data), [])
+        job = get_job_queue().status(st.session_state.save_job)
+    if job["status"] in (DONE, FAILED):
+        st.session_state.save_result = job
+        st.rerun()
+    st.info(f"Saving interview data ({job['step'] or job['status']}, attempt {job['attempts']})...")
+
+def show_save_status():
+    """The save job's outcome once it ended, otherwise a fragment polling for it"""
+    if st.session_state.save_result is None:
+        poll_save_status()
+    else:
+        show_save_result(st.session_state.save_result)
 
 def main():
     st.title("TalentScout Hiring Assistant")
@@ -198,7 +112,9 @@ def main():
             if api_key:
                 if validate_api_key(api_key):
                     st.session_state.api_key_configured = True
-                    st.session_state.chat = genai.GenerativeModel('gemini-pro').start_chat(history=[])
+                    st.session_state.api_key = api_key
+                    st.session_state.interview = new_interview()
+                    resume_session()
                     st.success("API key configured successfully!")
                     st.rerun()
                 else:
@@ -207,63 +123,57 @@ def main():
                 st.warning("Please enter an API key.")
         return
     
+    interview = st.session_state.interview
+    with st.sidebar:
+        stats = fast_path_stats.as_dict()
+        st.caption(f"Extraction calls: {stats['llm_calls']} sent, {stats['llm_skipped']} skipped, {stats['local_hits']} local hits")
+        cache_stats = get_llm_cache().stats()
+        if cache_stats:
+            st.caption("LLM cache hit rate: " + ", ".join(f"{site} {site_stats['hit_rate']:.0%}" for site, site_stats in cache_stats.items()))
+        ledger = get_token_ledger()
+        session_tokens = ledger.session_totals(get_checkpoint_log().session_id)["total_tokens"]
+        st.caption(f"Tokens: {session_tokens} this interview, {ledger.day_totals()['total_tokens']} today" + (" (over budget, economy mode)" if interview.downgraded else ""))
+    
     # Main chat interface
-    for message in st.session_state.messages:
-        with st.chat_message(message["role"]):
-            st.write(message["content"])
+    for message in interview.messages:
+        with st.chat_message(message.role):
+            st.write(message.content)
     
-    if not st.session_state.messages:
-        response = st.session_state.chat.send_message(get_initial_prompt())
+    if not interview.messages:
+        mark = take_mark(interview.candidate_data)
         with st.chat_message("assistant"):
-            st.write(response.text)
-        st.session_state.messages.append({"role": "assistant", "content": response.text})
+            st.write_stream(interview.stream_start())
+        checkpoint_turn(mark, interview.messages[-1:])
     
     if user_input := st.chat_input("Type your message here..."):
         with st.chat_message("user"):
             st.write(user_input)
         
-        st.session_state.messages.append({"role": "user", "content": user_input})
+        mark = take_mark(interview.candidate_data)
+        metrics = get_metrics()
         
         try:
-            st.session_state.candidate_data = extract_candidate_info(
-                user_input, 
-                st.session_state.candidate_data
-            )
-            
-            context = f"""Previous candidate data: {json.dumps(st.session_state.candidate_data)}
-            Remember to:
-            1. Acknowledge any information shared
-            2. Ask for missing information naturally
-            3. Generate technical questions if tech stack is provided and questions haven't been asked
-            4. Mark interview as complete by saying "INTERVIEW COMPLETE" if:
-               - All basic information is collected
-               - At least 3 technical questions have been asked and answered
-            5. Stay conversational and friendly
-            6. Number your technical questions (1., 2., 3.)"""
-            
-            response = st.session_state.chat.send_message(
-                f"{context}\n\nUser message: {user_input}"
-            )
-            
-            questions = extract_tech_questions(response.text)
-            if questions:
-                st.session_state.candidate_data["interview"]["questions"].extend(questions)
-            
-            if st.session_state.candidate_data["interview"]["questions"] and len(st.session_state.candidate_data["interview"]["questions"]) > len(st.session_state.candidate_data["interview"]["answers"]):
-                st.session_state.candidate_data["interview"]["answers"].append(user_input)
-            
             with st.chat_message("assistant"):
-                st.write(response.text)
+                st.write_stream(interview.stream_turn(user_input))
+            turn = interview.last_turn
+            for error in turn.errors:
+                st.error(error)
             
-            st.session_state.messages.append({"role": "assistant", "content": response.text})
+            if turn.completed:
+                # Evaluation and saving run in the background, the page polls the job
+                st.session_state.save_job = interview.submit()
             
-            if "INTERVIEW COMPLETE" in response.text and not st.session_state.interview_complete:
-                save_candidate_data(st.session_state.candidate_data)
-                st.session_state.interview_complete = True
+            with metrics.time_stage("checkpoint", interview.session_id):
+                checkpoint_turn(mark, interview.messages[-2:])
                 
         except Exception as e:
+            metrics.errors.inc("turn")
             st.error(f"An error occurred: {str(e)}")
             st.warning("Please try again or refresh the page if the error persists.")
+    
+    # Last, so a poll that sees the job end and reruns the page never cuts a turn short
+    if st.session_state.save_job:
+        show_save_status()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
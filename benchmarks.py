@@ -0,0 +1,240 @@
+# Micro-benchmarks for the pure-Python turn hot paths, compared against stored baselines
+import json
+import os
+import pickle
+import random
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+from candidate import CandidateProfile, Transcript
+from context_builder import build_turn_context
+from extraction import local_extract, validate_email, validate_phone
+from interview import QuestionParser, extract_tech_questions
+from persistence import candidate_filename, clean_candidate_data
+
+DEFAULT_BASELINE_PATH = "benchmark_baseline.json"
+
+# Slowdown against the baseline, as a fraction, that counts as a regression
+DEFAULT_THRESHOLD = 0.2
+
+# Interview lengths the per-interview benchmarks run at, from one turn to a very long interview
+TURN_COUNTS = [1, 20, 200]
+
+# Reply sizes for question parsing, in bytes
+REPLY_SIZES = [300, 5_000, 50_000]
+
+PROSE = [
+    "Thanks for sharing that, it sounds like you've done some interesting work with Python 3.10 and async code.",
+    "Since you mentioned 2.5 years with Django, let's go a little deeper into how you structure larger projects.",
+    "Take your time with each one, there are no trick questions here.",
+    "It's great to hear you've been working with cloud deployments on AWS for the past 3.5 years.",
+]
+QUESTIONS = [
+    "Can you explain the difference between a list and a tuple in Python?",
+    "How does Django's ORM handle lazy evaluation of querysets?",
+    "What happens when you await a coroutine that raises an exception?",
+    "How would you find a memory leak in a long-running service?",
+    "What is the difference between a process and a thread?",
+]
+MESSAGES = [
+    "Hi, I'm Priya Sharma",
+    "My email is priya.sharma@example.com and my phone is +91 98765 43210",
+    "I have 4 years of experience as a backend developer",
+    "I'm based in Bangalore but open to relocating to Berlin",
+    "I mostly work with Python, Django, PostgreSQL and Docker, some React on the side",
+    "I would use a generator there so the whole file never has to sit in memory at once.",
+    "Lists are mutable while tuples are not, which also makes tuples hashable when their items are.",
+    "Sure, go ahead",
+]
+
+def long_reply(size: int, rng: random.Random) -> str:
+    """Assistant reply of roughly size bytes with numbered questions between paragraphs of prose"""
+    parts = []
+    number = 1
+    while sum(len(part) for part in parts) < size:
+        parts.append(" ".join(rng.choice(PROSE) for _ in range(rng.randint(1, 3))))
+        parts.append(f"{number}. {rng.choice(QUESTIONS)}")
+        number += 1
+    return "\n\n".join(parts) + "\n\nINTERVIEW COMPLETE"
+
+def contact_samples(count: int, rng: random.Random) -> List[str]:
+    valid = ["priya.sharma@example.com", "a.b+tag@sub.example.co.in", "+919876543210", "15551234567"]
+    invalid = ["priya@", "not an email", "@example.com", "12345", "+91 98765 43210", "x" * 200 + "@example"]
+    return [rng.choice(valid if rng.random() < 0.5 else invalid) for _ in range(count)]
+
+def interview_data(turns: int, rng: random.Random) -> Dict:
+    """Candidate data after an interview with turns question/answer pairs"""
+    data = CandidateProfile().to_dict()
+    data.update({
+        "name": "Priya Sharma", "email": "priya.sharma@example.com", "phone": "+919876543210",
+        "experience": "4 years", "position": "Backend Developer", "location": "Bangalore",
+        "tech_stack": ["Python", "Django", "PostgreSQL", "Docker"],
+    })
+    data["interview"]["questions"] = [f"{rng.choice(QUESTIONS)} ({i})" for i in range(turns)]
+    data["interview"]["answers"] = [rng.choice(MESSAGES[5:]) for _ in range(turns)]
+    return data
+
+def bench_extract_tech_questions(size: int) -> Callable:
+    reply = long_reply(size, random.Random(size))
+    return lambda: extract_tech_questions(reply)
+
+def bench_extract_tech_questions_long_numbers(size: int) -> Callable:
+    # Long digit runs (ids, hashes, numeric output in code blocks) used to make the parser backtrack
+    rng = random.Random(size)
+    reply = long_reply(size // 2, rng) + "\n\n" + " ".join("".join(rng.choice("0123456789") for _ in range(1000)) for _ in range(size // 2002))
+    return lambda: extract_tech_questions(reply)
+
+def bench_question_parser_stream(size: int) -> Callable:
+    reply = long_reply(size, random.Random(size))
+    chunks = [reply[i:i + 24] for i in range(0, len(reply), 24)]
+
+    def run():
+        parser = QuestionParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+    return run
+
+def bench_validators(count: int) -> Callable:
+    samples = contact_samples(count, random.Random(count))
+
+    def run():
+        for sample in samples:
+            validate_email(sample)
+            validate_phone(sample)
+    return run
+
+def bench_merge(turns: int) -> Callable:
+    rng = random.Random(turns)
+    messages = [rng.choice(MESSAGES) for _ in range(turns)]
+
+    def run():
+        profile = CandidateProfile()
+        for message in messages:
+            profile.merge(local_extract(message), local=True)
+    return run
+
+def bench_context(turns: int) -> Callable:
+    rng = random.Random(turns)
+    states = []
+    for turn in range(1, turns + 1):
+        data = interview_data(turn // 2, rng)
+        # Fields fill in over the first turns, as they do in a real interview
+        for field in ["name", "email", "phone", "experience", "position", "location", "tech_stack"][turn:]:
+            data[field] = [] if field == "tech_stack" else ""
+        states.append(data)
+
+    def run():
+        snapshot = {}
+        for data in states:
+            _, snapshot = build_turn_context(data, snapshot)
+    return run
+
+def bench_save(turns: int) -> Callable:
+    data = interview_data(turns, random.Random(turns))
+    data["name"] = "Priya  O'Brien-Sharma / Dev"
+
+    def run():
+        cleaned = clean_candidate_data(data)
+        json.dumps(cleaned, indent=4)
+        candidate_filename(cleaned)
+    return run
+
+def bench_session_pickle(turns: int) -> Callable:
+    # What a session store or Streamlit's serializable session state pays per save and load
+    rng = random.Random(turns)
+    transcript = Transcript()
+    for _ in range(turns):
+        transcript.append("assistant", " ".join(rng.choice(PROSE) for _ in range(2)))
+        transcript.append("user", rng.choice(MESSAGES))
+    state = (CandidateProfile.from_dict(interview_data(turns, rng)), transcript)
+    return lambda: pickle.loads(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+
+BENCHMARKS: Dict[str, Callable[[], Callable]] = {}
+for size in REPLY_SIZES:
+    BENCHMARKS[f"extract_tech_questions/{size}B"] = lambda size=size: bench_extract_tech_questions(size)
+BENCHMARKS["extract_tech_questions/50000B_long_numbers"] = lambda: bench_extract_tech_questions_long_numbers(50_000)
+for size in REPLY_SIZES:
+    BENCHMARKS[f"question_parser_stream/{size}B"] = lambda size=size: bench_question_parser_stream(size)
+BENCHMARKS["validators/1000"] = lambda: bench_validators(1000)
+for prefix, bench in [("profile_merge", bench_merge), ("build_turn_context", bench_context), ("save_serialization", bench_save),
+                      ("session_pickle", bench_session_pickle)]:
+    for turns in TURN_COUNTS:
+        BENCHMARKS[f"{prefix}/{turns}_turns"] = lambda bench=bench, turns=turns: bench(turns)
+
+def time_call(fn: Callable, min_time: float = 0.2, repeat: int = 5) -> float:
+    """Seconds per call, the best of repeat rounds of at least min_time each"""
+    # Find a loop count that takes at least min_time, as timeit's autorange does
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / elapsed) + 1) if elapsed else number * 10
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+def run_benchmarks(pattern: Optional[str] = None, min_time: float = 0.2, repeat: int = 5, report=None) -> Dict[str, float]:
+    """Seconds per call for every benchmark whose name matches the pattern regex"""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if pattern and not re.search(pattern, name):
+            continue
+        results[name] = time_call(setup(), min_time, repeat)
+        if report:
+            report(name, results[name])
+    return results
+
+def load_baseline(path: str = DEFAULT_BASELINE_PATH) -> Dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["results"]
+
+def save_baseline(results: Dict[str, float], path: str = DEFAULT_BASELINE_PATH):
+    """Merge results into the baseline file, keeping benchmarks that weren't run"""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, 'w') as f:
+        json.dump({"results": dict(sorted(baseline.items()))}, f, indent=4)
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """One row per benchmark with its change against the baseline"""
+    rows = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        ratio = seconds / base if base else None
+        if ratio is None:
+            status = "new"
+        elif ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({"name": name, "seconds": seconds, "baseline": base, "ratio": ratio, "status": status})
+    return rows
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    return f"{seconds * 1e3:.2f} ms"
+
+def format_comparison(rows: List[Dict]) -> str:
+    lines = [f"{'benchmark':<44} {'time':>11} {'baseline':>11} {'change':>8}  status"]
+    for row in rows:
+        change = "-" if row["ratio"] is None else f"{row['ratio'] - 1:+.0%}"
+        lines.append(f"{row['name']:<44} {format_duration(row['seconds']):>11} {format_duration(row['baseline']):>11} {change:>8}  {row['status']}")
+    return "\n".join(lines)
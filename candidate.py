@@ -0,0 +1,148 @@
+# Compact in-memory records for a live interview: candidate profile with its questions and answers, and transcript
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from extraction import PROFILE_FIELDS
+from storage import tech_list
+
+ROLES = ("user", "assistant")
+
+@dataclass(slots=True)
+class Message:
+    role: str
+    content: str
+
+    def to_dict(self) -> Dict:
+        return {"role": self.role, "content": self.content}
+
+@dataclass(slots=True)
+class CandidateProfile:
+    """Candidate fields with fixed types, plus the questions asked and the answers given
+
+    Questions and answers are flat lists of strings, answers pairing up with
+    questions in order. to_dict and from_dict convert to and from the candidate
+    data dict that checkpoints, storage and evaluation keep using.
+    """
+
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    experience: str = ""
+    position: str = ""
+    location: str = ""
+    tech_stack: List[str] = field(default_factory=list)
+    questions: List[str] = field(default_factory=list)
+    answers: List[str] = field(default_factory=list)
+    evaluation_summary: str = ""
+
+    def merge(self, new_info: Dict, local: bool = False):
+        """Fill empty profile fields from new_info, ignoring other keys
+
+        Technologies the model extracts are added to the stack, so an early
+        local guess doesn't block them. local marks local_extract matches, which
+        only fill an empty stack. Once questions were asked the stack is left
+        alone, answers name technologies the candidate never claimed.
+        """
+        for key in PROFILE_FIELDS:
+            value = new_info.get(key)
+            if not value:
+                continue
+            if key == "tech_stack":
+                if self.questions or (local and self.tech_stack):
+                    continue
+                known = {tech.lower() for tech in self.tech_stack}
+                self.tech_stack += [tech for tech in tech_list(value) if tech.lower() not in known]
+            elif not getattr(self, key):
+                setattr(self, key, str(value))
+
+    def add_answer(self, answer: str) -> bool:
+        """Record answer for the oldest unanswered question, False when none is waiting"""
+        if len(self.answers) >= len(self.questions):
+            return False
+        self.answers.append(answer)
+        return True
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "email": self.email,
+            "phone": self.phone,
+            "experience": self.experience,
+            "position": self.position,
+            "location": self.location,
+            "tech_stack": list(self.tech_stack),
+            "interview": {
+                "questions": list(self.questions),
+                "answers": list(self.answers),
+            },
+            "evaluation_summary": self.evaluation_summary,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CandidateProfile":
+        interview = data.get("interview") or {}
+        questions = [str(question) for question in interview.get("questions") or []]
+        return cls(
+            **{key: str(data.get(key) or "") for key in PROFILE_FIELDS if key != "tech_stack"},
+            tech_stack=tech_list(data.get("tech_stack")),
+            questions=questions,
+            answers=[str(answer) for answer in interview.get("answers") or []][:len(questions)],
+            evaluation_summary=data.get("evaluation_summary") or "",
+        )
+
+    def to_state(self) -> tuple:
+        """Every field in order as plain values, for fast pickling"""
+        return (
+            self.name, self.email, self.phone, self.experience, self.position, self.location,
+            self.tech_stack, self.questions, self.answers, self.evaluation_summary,
+        )
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "CandidateProfile":
+        return cls(*state)
+
+    def __reduce__(self):
+        # One flat tuple pickles much faster than the per-slot state dataclasses use
+        return (CandidateProfile.from_state, (self.to_state(),))
+
+class Transcript:
+    """Chat messages stored as a role byte per message and a list of contents
+
+    Indexing and iteration give Message records. Far smaller than a list of
+    role/content dicts, and pickles as one bytes object and one list of strings.
+    """
+
+    __slots__ = ("_roles", "_contents")
+
+    def __init__(self, roles: bytes = b"", contents: Optional[List[str]] = None):
+        self._roles = bytearray(roles)
+        self._contents = contents if contents is not None else []
+
+    @classmethod
+    def from_dicts(cls, messages: List[Dict]) -> "Transcript":
+        transcript = cls()
+        for message in messages:
+            transcript.append(message["role"], message["content"])
+        return transcript
+
+    def append(self, role: str, content: str):
+        self._roles.append(ROLES.index(role))
+        self._contents.append(content)
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Message(ROLES[role], content) for role, content in zip(self._roles[index], self._contents[index])]
+        return Message(ROLES[self._roles[index]], self._contents[index])
+
+    def __iter__(self) -> Iterator[Message]:
+        for role, content in zip(self._roles, self._contents):
+            yield Message(ROLES[role], content)
+
+    def to_dicts(self) -> List[Dict]:
+        return [{"role": ROLES[role], "content": content} for role, content in zip(self._roles, self._contents)]
+
+    def __reduce__(self):
+        return (Transcript, (bytes(self._roles), self._contents))
@@ -0,0 +1,182 @@
+# On-disk inverted index over saved interviews so queries don't reparse every file
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+from extraction import KNOWN_LOCATIONS, local_extract, parse_experience_years
+from persistence import CANDIDATES_DIR
+from storage import tech_list
+
+INDEX_FILENAME = ".talentscout_index.json"
+INDEX_VERSION = 1
+
+# Both the current *_interview.json files and the older candidate_*.json ones
+CANDIDATE_FILE = re.compile(r'^(candidate_.*|.*_interview)\.json$')
+WORD = re.compile(r'[a-z0-9+#.]+')
+
+def normalize_tech(term: str) -> str:
+    return term.strip().lower()
+
+def position_terms(position: str) -> Set[str]:
+    return set(WORD.findall((position or "").lower()))
+
+def normalize_location(location: str) -> str:
+    location = (location or "").strip().lower()
+    return KNOWN_LOCATIONS.get(location, location).lower()
+
+def split_terms(value: str) -> List[str]:
+    """Split "Python + Langchain" or "python, langchain" into separate terms"""
+    return [term.strip() for term in re.split(r'[+,/&]| and ', value) if term.strip()]
+
+def document_from_candidate(filename: str, data: Dict) -> Dict:
+    """The fields of a saved interview that the index keeps"""
+    tech = tech_list(data.get("tech_stack"))
+    if not tech:
+        # Older files often left tech_stack empty while the answers name the stack
+        answers = (data.get("interview") or {}).get("answers") or []
+        tech = local_extract(" ".join(answers)).get("tech_stack", [])
+    return {
+        "file": filename,
+        "name": data.get("name") or "",
+        "email": data.get("email") or "",
+        "position": data.get("position") or "",
+        "location": data.get("location") or "",
+        "experience_years": parse_experience_years(data.get("experience")),
+        "tech": tech,
+        "evaluation_summary": data.get("evaluation_summary") or "",
+    }
+
+class CandidateIndex:
+    """Postings for tech term, position word and location, keyed by file name
+
+    The index remembers each file's mtime and size, so refresh() only parses new
+    or changed files and drops postings for deleted ones.
+    """
+
+    def __init__(self, directory: str = CANDIDATES_DIR, index_path: Optional[str] = None):
+        self.directory = directory
+        self.index_path = index_path or os.path.join(directory, INDEX_FILENAME)
+        self.files: Dict[str, List[float]] = {}
+        self.docs: Dict[str, Dict] = {}
+        self.tech: Dict[str, Set[str]] = {}
+        self.position: Dict[str, Set[str]] = {}
+        self.location: Dict[str, Set[str]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path) as f:
+                saved = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if saved.get("version") != INDEX_VERSION:
+            return
+        self.files = saved["files"]
+        self.docs = saved["docs"]
+        for postings, name in ((self.tech, "tech"), (self.position, "position"), (self.location, "location")):
+            postings.update({term: set(ids) for term, ids in saved[name].items()})
+
+    def save(self):
+        saved = {
+            "version": INDEX_VERSION,
+            "files": self.files,
+            "docs": self.docs,
+            "tech": {term: sorted(ids) for term, ids in self.tech.items()},
+            "position": {term: sorted(ids) for term, ids in self.position.items()},
+            "location": {term: sorted(ids) for term, ids in self.location.items()},
+        }
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(saved, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def _postings_for(self, doc: Dict) -> Iterable:
+        for term in doc["tech"]:
+            yield self.tech, normalize_tech(term)
+        for term in position_terms(doc["position"]):
+            yield self.position, term
+        if doc["location"]:
+            yield self.location, normalize_location(doc["location"])
+
+    def _add(self, doc_id: str, doc: Dict):
+        self.docs[doc_id] = doc
+        for postings, term in self._postings_for(doc):
+            postings.setdefault(term, set()).add(doc_id)
+
+    def _remove(self, doc_id: str):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        for postings, term in self._postings_for(doc):
+            ids = postings.get(term)
+            if ids:
+                ids.discard(doc_id)
+                if not ids:
+                    del postings[term]
+
+    def refresh(self) -> Dict:
+        """Bring the index up to date with the directory, returns what changed"""
+        seen = set()
+        added = updated = 0
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if not entry.is_file() or not CANDIDATE_FILE.match(entry.name):
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                signature = [stat.st_mtime, stat.st_size]
+                if self.files.get(entry.name) == signature:
+                    continue
+                try:
+                    with open(entry.path) as f:
+                        data = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    continue
+                if entry.name in self.files:
+                    self._remove(entry.name)
+                    updated += 1
+                else:
+                    added += 1
+                self._add(entry.name, document_from_candidate(entry.name, data))
+                self.files[entry.name] = signature
+
+        removed = [name for name in self.files if name not in seen]
+        for name in removed:
+            self._remove(name)
+            del self.files[name]
+
+        if added or updated or removed:
+            self.save()
+        return {"added": added, "updated": updated, "removed": len(removed), "total": len(self.docs)}
+
+    def query(self, tech: List[str] = None, position: str = None, location: str = None,
+              min_experience: float = None, max_experience: float = None) -> List[Dict]:
+        """Candidates matching every given filter, intersecting the smallest postings first"""
+        candidate_sets = []
+        for term in tech or []:
+            candidate_sets.append(self.tech.get(normalize_tech(term), set()))
+        for term in position_terms(position):
+            candidate_sets.append(self.position.get(term, set()))
+        if location:
+            candidate_sets.append(self.location.get(normalize_location(location), set()))
+
+        if candidate_sets:
+            candidate_sets.sort(key=len)
+            ids = set(candidate_sets[0])
+            for other in candidate_sets[1:]:
+                ids &= other
+        else:
+            ids = set(self.docs)
+
+        results = []
+        for doc_id in sorted(ids):
+            years = self.docs[doc_id]["experience_years"]
+            if min_experience is not None and (years is None or years < min_experience):
+                continue
+            if max_experience is not None and (years is None or years > max_experience):
+                continue
+            results.append(self.docs[doc_id])
+        return results
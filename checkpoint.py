@@ -0,0 +1,131 @@
+# Append-only per-session checkpoint log so unfinished interviews survive restarts
+import copy
+import json
+import os
+import re
+from typing import Callable, Dict, List, Optional
+
+from candidate import CandidateProfile
+from extraction import PROFILE_FIELDS
+
+CHECKPOINTS_DIR = "checkpoints"
+
+def empty_state() -> Dict:
+    return {
+        "messages": [],
+        "candidate_data": CandidateProfile().to_dict(),
+        "interview_complete": False,
+        "save_job": None,
+    }
+
+def take_mark(candidate_data: Dict) -> Dict:
+    """What the candidate data looked like before a turn, to compute the turn's delta"""
+    return {
+        "fields": {field: copy.deepcopy(candidate_data.get(field)) for field in PROFILE_FIELDS},
+        "questions": len(candidate_data["interview"]["questions"]),
+        "answers": len(candidate_data["interview"]["answers"]),
+    }
+
+def turn_delta(mark: Dict, candidate_data: Dict, messages: List[Dict], interview_complete: bool = False,
+               save_job: Optional[str] = None) -> Dict:
+    """Checkpoint record with only what a turn added, plus the save job once one was queued"""
+    record = {"type": "turn", "messages": messages}
+    fields = {field: candidate_data.get(field) for field in PROFILE_FIELDS if candidate_data.get(field) != mark["fields"][field]}
+    if fields:
+        record["fields"] = fields
+    questions = candidate_data["interview"]["questions"][mark["questions"]:]
+    if questions:
+        record["questions"] = questions
+    answers = candidate_data["interview"]["answers"][mark["answers"]:]
+    if answers:
+        record["answers"] = answers
+    if interview_complete:
+        record["complete"] = True
+    if save_job:
+        record["save_job"] = save_job
+    return record
+
+def apply_record(state: Dict, record: Dict) -> Dict:
+    """Replay one checkpoint record onto a session state"""
+    if record["type"] == "snapshot":
+        # Snapshots written before a key existed get its default
+        return dict(empty_state(), **copy.deepcopy(record["state"]))
+    state["messages"].extend(record.get("messages", []))
+    state["candidate_data"].update(record.get("fields", {}))
+    state["candidate_data"]["interview"]["questions"].extend(record.get("questions", []))
+    state["candidate_data"]["interview"]["answers"].extend(record.get("answers", []))
+    if record.get("complete"):
+        state["interview_complete"] = True
+    if record.get("save_job"):
+        state["save_job"] = record["save_job"]
+    return state
+
+class CheckpointLog:
+    """JSONL log of per-turn deltas for one session
+
+    Each turn appends one small record. Once compact_every records have piled up
+    since the last snapshot, the log is rewritten as a single snapshot, so the
+    write cost per turn stays proportional to the turn's delta.
+    """
+
+    def __init__(self, session_id: str, directory: str = CHECKPOINTS_DIR, compact_every: int = 50):
+        if not re.fullmatch(r'[A-Za-z0-9_-]+', session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        self.session_id = session_id
+        self.path = os.path.join(directory, f"{session_id}.jsonl")
+        self.compact_every = compact_every
+        self.records_since_snapshot = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def append(self, record: Dict):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + "\n")
+        self.records_since_snapshot += 1
+
+    def load(self) -> Dict:
+        """Rebuild the session state from the log, skipping unreadable lines
+
+        A torn last line is cut off the file, so the next append starts on a
+        line of its own instead of being glued onto it and lost.
+        """
+        state = empty_state()
+        if not self.exists():
+            return state
+
+        self.records_since_snapshot = 0
+        line, size, torn = b"", 0, False
+        with open(self.path, 'rb') as f:
+            for line in f:
+                size += len(line)
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    torn = not line.endswith(b"\n")
+                    continue
+                state = apply_record(state, record)
+                self.records_since_snapshot = 0 if record["type"] == "snapshot" else self.records_since_snapshot + 1
+        if torn:
+            os.truncate(self.path, size - len(line))
+        elif line and not line.endswith(b"\n"):
+            # A whole record whose newline never reached the disk
+            with open(self.path, 'ab') as f:
+                f.write(b"\n")
+        return state
+
+    def maybe_compact(self, get_state: Callable[[], Dict]):
+        """Replace the log with a snapshot of get_state() once enough deltas have piled up"""
+        if self.records_since_snapshot < self.compact_every:
+            return
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({"type": "snapshot", "state": get_state()}, separators=(',', ':')) + "\n")
+        os.replace(tmp_path, self.path)
+        self.records_since_snapshot = 0
+
+    def delete(self):
+        if self.exists():
+            os.remove(self.path)
@@ -0,0 +1,89 @@
+# Process-wide Gemini model registry shared by every session
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Tuple
+
+import google.ai.generativelanguage as glm
+import google.generativeai as genai
+
+DEFAULT_MODEL = "gemini-pro"
+
+# How long a key check is trusted before it is made again
+KEY_VALIDATION_TTL = 3600
+
+# "gemini" for the real API, "fake" for an in-process fake_llm model, "http" for a fake_llm server
+LLM_BACKEND = os.getenv("TALENTSCOUT_LLM_BACKEND", "gemini")
+
+_lock = threading.Lock()
+_models: Dict[Tuple[str, str], genai.GenerativeModel] = {}
+_clients: Dict[str, Tuple[glm.GenerativeServiceClient, glm.GenerativeServiceAsyncClient]] = {}
+_validated: Dict[str, Tuple[bool, float]] = {}
+
+def _key_id(api_key: str) -> str:
+    """Registry key for an API key, so the raw key isn't kept around as a dict key"""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+def _key_clients(api_key: str) -> Tuple[glm.GenerativeServiceClient, glm.GenerativeServiceAsyncClient]:
+    """Sync and async generation clients for api_key, call with _lock held
+
+    genai.configure keeps one process-wide key that models pick up lazily on
+    their first call, so each model gets clients built with its own key instead.
+    """
+    key_id = _key_id(api_key)
+    if key_id not in _clients:
+        options = {"api_key": api_key}
+        _clients[key_id] = (
+            glm.GenerativeServiceClient(client_options=options),
+            glm.GenerativeServiceAsyncClient(client_options=options),
+        )
+    return _clients[key_id]
+
+def validate_api_key(api_key: str, ttl: float = KEY_VALIDATION_TTL) -> bool:
+    """Validate the Gemini API key with a model listing call, cached for ttl seconds"""
+    if LLM_BACKEND != "gemini":
+        return True
+    key_id = _key_id(api_key)
+    cached = _validated.get(key_id)
+    if cached and time.monotonic() - cached[1] < ttl:
+        return cached[0]
+
+    try:
+        # Listing models is free and fails straight away on a bad key
+        next(iter(genai.list_models(client=glm.ModelServiceClient(client_options={"api_key": api_key}))), None)
+        valid = True
+    except Exception:
+        valid = False
+    with _lock:
+        _validated[key_id] = (valid, time.monotonic())
+    return valid
+
+def _fake_model(model_name: str):
+    import fake_llm
+    if LLM_BACKEND == "http":
+        return fake_llm.HTTPGenerativeModel(os.getenv("TALENTSCOUT_FAKE_LLM_URL", "http://127.0.0.1:8765"), f"models/fake-{model_name}")
+    return fake_llm.FakeGenerativeModel(
+        f"models/fake-{model_name}",
+        latency=os.getenv("TALENTSCOUT_FAKE_LATENCY", "fixed:0"),
+        error_rate=float(os.getenv("TALENTSCOUT_FAKE_ERROR_RATE", "0")),
+        seed=int(os.getenv("TALENTSCOUT_FAKE_SEED", "0")),
+    )
+
+def get_model(api_key: str, model_name: str = DEFAULT_MODEL) -> genai.GenerativeModel:
+    """Shared model object for api_key and model_name, created on first use
+
+    Every model is bound to clients built with its own api_key, so calls are
+    never made with another session's key. With TALENTSCOUT_LLM_BACKEND set to
+    fake or http the model is a fake_llm stand-in and api_key is not used.
+    """
+    registry_key = (_key_id(api_key), model_name)
+    with _lock:
+        if registry_key not in _models:
+            if LLM_BACKEND == "gemini":
+                model = genai.GenerativeModel(model_name)
+                model._client, model._async_client = _key_clients(api_key)
+            else:
+                model = _fake_model(model_name)
+            _models[registry_key] = model
+        return _models[registry_key]
@@ -0,0 +1,77 @@
+# Compact per-turn context: only what is missing and what changed since the last turn
+import json
+from typing import Dict, Tuple
+
+from extraction import PROFILE_FIELDS
+
+CONTEXT_INSTRUCTIONS = """Remember to:
+            1. Acknowledge any information shared
+            2. Ask for missing information naturally
+            3. Generate technical questions if tech stack is provided and questions haven't been asked
+            4. Mark interview as complete by saying "INTERVIEW COMPLETE" if:
+               - All basic information is collected
+               - At least 3 technical questions have been asked and answered
+            5. Stay conversational and friendly
+            6. Number your technical questions (1., 2., 3.)"""
+
+# Rough size of a Gemini token in bytes of English text
+BYTES_PER_TOKEN = 4
+
+# Longest value sent for a single changed field before it is cut short
+MAX_VALUE_CHARS = 200
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate for budgeting prompts"""
+    return max(1, len(text.encode("utf-8")) // BYTES_PER_TOKEN)
+
+def snapshot_candidate_data(candidate_data: Dict) -> Dict:
+    """Small copy of the fields the context reports on, to diff against next turn"""
+    snapshot = {field: candidate_data.get(field) for field in PROFILE_FIELDS}
+    snapshot["tech_stack"] = list(snapshot["tech_stack"] or []) if isinstance(snapshot["tech_stack"], list) else snapshot["tech_stack"]
+    snapshot["questions"] = len(candidate_data["interview"]["questions"])
+    snapshot["answers"] = len(candidate_data["interview"]["answers"])
+    return snapshot
+
+def _shorten(value, limit: int):
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + "..."
+    if isinstance(value, list):
+        return [_shorten(item, limit) for item in value]
+    return value
+
+def build_turn_context(candidate_data: Dict, previous: Dict, max_bytes: int = 1200) -> Tuple[str, Dict]:
+    """Build the per-turn context and the snapshot to pass in on the next turn
+
+    The chat history already holds every earlier turn, so only the missing fields,
+    the fields that changed since the previous snapshot and the interview progress
+    are sent. The data part is kept within max_bytes.
+    """
+    snapshot = snapshot_candidate_data(candidate_data)
+    changed = {
+        field: snapshot[field]
+        for field in PROFILE_FIELDS
+        if snapshot[field] and snapshot[field] != previous.get(field)
+    }
+    missing = [field for field in PROFILE_FIELDS if not snapshot[field]]
+
+    def render(changed_fields: Dict) -> str:
+        lines = ["Candidate data update:"]
+        if changed_fields:
+            lines.append(f"- Newly recorded: {json.dumps(changed_fields, ensure_ascii=False)}")
+        lines.append(f"- Still missing: {', '.join(missing) if missing else 'nothing'}")
+        lines.append(f"- Technical questions asked: {snapshot['questions']}, answered: {snapshot['answers']}")
+        return "\n            ".join(lines)
+
+    data_part = render(changed)
+
+    # Over budget: shorten long values first, then drop changed fields one by one
+    limit = MAX_VALUE_CHARS
+    while len(data_part.encode("utf-8")) > max_bytes and changed:
+        if limit > 20:
+            limit //= 2
+            changed = {field: _shorten(value, limit) for field, value in changed.items()}
+        else:
+            changed.pop(next(reversed(changed)))
+        data_part = render(changed)
+
+    return f"{data_part}\n            {CONTEXT_INSTRUCTIONS}", snapshot
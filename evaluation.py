@@ -0,0 +1,188 @@
+# Candidate evaluation prompts, kept free of Streamlit so background workers can use them
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, List, Tuple
+
+from llm_cache import get_llm_cache
+from metrics import get_metrics
+from semantic_cache import get_semantic_cache
+
+logger = logging.getLogger(__name__)
+
+# Score against a per-stack rubric, shared between candidates with similar stacks
+USE_RUBRIC = os.getenv("TALENTSCOUT_EVALUATION_RUBRIC", "0") == "1"
+
+RUBRIC_PROMPT = """
+    Write a short rubric for screening a candidate with {experience} of experience in {tech_stack}.
+    List 3 to 5 things a good answer to a basic technical question in this stack shows.
+
+    Format: Return only the rubric as a short bulleted list, nothing else.
+    """
+
+def build_rubric_prompt(candidate_data: Dict) -> str:
+    tech_stack = ', '.join(candidate_data['tech_stack']) if isinstance(candidate_data['tech_stack'], list) else candidate_data['tech_stack']
+    return RUBRIC_PROMPT.format(experience=candidate_data['experience'], tech_stack=tech_stack)
+
+def cache_rubric(candidate_data: Dict, rubric: str):
+    try:
+        get_semantic_cache().add("rubric", candidate_data['tech_stack'], candidate_data['experience'], rubric)
+    except Exception:
+        # The rubric is still used for this evaluation, only later candidates miss it
+        logger.exception("Could not cache the rubric")
+
+def get_rubric(model, candidate_data: Dict) -> str:
+    """Rubric for the candidate's stack, generated once per similar stack and band"""
+    rubric = get_semantic_cache().lookup("rubric", candidate_data['tech_stack'], candidate_data['experience'])
+    if rubric is None:
+        with get_metrics().llm_call("rubric"):
+            rubric = model.generate_content(build_rubric_prompt(candidate_data)).text.strip()
+        cache_rubric(candidate_data, rubric)
+    return rubric
+
+async def get_rubric_async(model, candidate_data: Dict) -> str:
+    # Cache lookups and writes can wait on its lock or the disk, so they run off the event loop
+    rubric = await asyncio.to_thread(get_semantic_cache().lookup, "rubric", candidate_data['tech_stack'], candidate_data['experience'])
+    if rubric is None:
+        with get_metrics().llm_call("rubric"):
+            rubric = (await model.generate_content_async(build_rubric_prompt(candidate_data))).text.strip()
+        await asyncio.to_thread(cache_rubric, candidate_data, rubric)
+    return rubric
+
+def build_evaluation_prompt(candidate_data: Dict, rubric: str = "") -> str:
+    """Prompt asking for a single line evaluation of the candidate"""
+    rubric_section = f"""
+    Rubric for this stack:
+    {rubric}
+    """ if rubric else ""
+    return f"""
+    Evaluate the candidate based on:
+    {rubric_section}
+    Background:
+    - Experience: {candidate_data['experience']}
+    - Position: {candidate_data['position']}
+    - Tech Stack: {', '.join(candidate_data['tech_stack']) if isinstance(candidate_data['tech_stack'], list) else candidate_data['tech_stack']}
+    
+    Interview Performance:
+    Questions and Answers:
+    {json.dumps(dict(zip(candidate_data['interview']['questions'], candidate_data['interview']['answers'])), indent=2)}
+
+    Provide a SINGLE LINE evaluation summary (maximum 100 characters) that assesses:
+    1. Experience relevance
+    2. Technical knowledge
+    3. Overall suitability
+    
+    Format: Return only the evaluation summary, nothing else.
+    """
+
+def can_evaluate(candidate_data: Dict) -> bool:
+    """Whether there is enough data for an evaluation"""
+    return bool(candidate_data["experience"] and candidate_data["tech_stack"])
+
+def evaluate_candidate(model, candidate_data: Dict) -> str:
+    """Generate an evaluation summary with model, raising on API errors"""
+    if not can_evaluate(candidate_data):
+        return ""
+    
+    rubric = get_rubric(model, candidate_data) if USE_RUBRIC else ""
+    response = get_llm_cache().generate(model, build_evaluation_prompt(candidate_data, rubric), "evaluation")
+    return response.text.strip()
+
+async def evaluate_candidate_async(model, candidate_data: Dict) -> str:
+    """Non-blocking evaluate_candidate for use on an asyncio loop"""
+    if not can_evaluate(candidate_data):
+        return ""
+    
+    rubric = await get_rubric_async(model, candidate_data) if USE_RUBRIC else ""
+    response = await get_llm_cache().generate_async(model, build_evaluation_prompt(candidate_data, rubric), "evaluation")
+    return response.text.strip()
+
+def build_packed_evaluation_prompt(candidates: List[Tuple[str, Dict]]) -> str:
+    """One prompt evaluating several candidates, each under a short key"""
+    blocks = []
+    for key, candidate_data in candidates:
+        tech_stack = ', '.join(candidate_data['tech_stack']) if isinstance(candidate_data['tech_stack'], list) else candidate_data['tech_stack']
+        qa = json.dumps(dict(zip(candidate_data['interview']['questions'], candidate_data['interview']['answers'])))
+        blocks.append(f"""[{key}]
+    - Experience: {candidate_data['experience']}
+    - Position: {candidate_data['position']}
+    - Tech Stack: {tech_stack}
+    - Questions and Answers: {qa}""")
+    candidate_blocks = "\n\n    ".join(blocks)
+    
+    return f"""
+    Evaluate each of the following candidates on:
+    1. Experience relevance
+    2. Technical knowledge
+    3. Overall suitability
+    
+    Candidates:
+    
+    {candidate_blocks}
+    
+    Format: Return only a JSON array with one object per candidate, like
+    [{{"id": "c1", "summary": "..."}}], where id is the key in square brackets and
+    summary is a SINGLE LINE evaluation (maximum 100 characters). Nothing else.
+    """
+
+def parse_packed_evaluations(text: str, keys: List[str]) -> Dict[str, str]:
+    """Valid summaries from a packed evaluation response, keyed by candidate key
+
+    Entries that are malformed, use unknown keys or have an empty summary are
+    left out, so the caller can evaluate those candidates on their own.
+    """
+    text = text.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+    try:
+        entries = json.loads(text)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(entries, list):
+        return {}
+    
+    summaries = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        key, summary = entry.get("id"), entry.get("summary")
+        if key in keys and key not in summaries and isinstance(summary, str) and summary.strip():
+            summaries[key] = " ".join(summary.split())
+    return summaries
+
+async def evaluate_candidates_packed_async(model, candidates: List[Tuple[str, Dict]], before_request=None) -> Dict[str, str]:
+    """Evaluate several candidates in one request, falling back to single calls for bad entries
+
+    candidates is a list of (candidate id, data). Returns summaries by candidate
+    id. Candidates whose single-call fallback also fails are missing from the result.
+    before_request, if given, is awaited before every request (e.g. a rate limiter).
+    """
+    summaries = {}
+    keyed = {}
+    for candidate_id, candidate_data in candidates:
+        if can_evaluate(candidate_data):
+            keyed[f"c{len(keyed) + 1}"] = (candidate_id, candidate_data)
+        else:
+            summaries[candidate_id] = ""
+    
+    packed = {}
+    if len(keyed) > 1:
+        try:
+            if before_request:
+                await before_request()
+            prompt = build_packed_evaluation_prompt([(key, data) for key, (_, data) in keyed.items()])
+            response = await get_llm_cache().generate_async(model, prompt, "packed_evaluation")
+            packed = parse_packed_evaluations(response.text, list(keyed))
+        except Exception:
+            packed = {}
+    
+    for key, (candidate_id, candidate_data) in keyed.items():
+        if key in packed:
+            summaries[candidate_id] = packed[key]
+            continue
+        try:
+            if before_request:
+                await before_request()
+            summaries[candidate_id] = await evaluate_candidate_async(model, candidate_data)
+        except Exception:
+            continue
+    return summaries
@@ -0,0 +1,181 @@
+# Local, deterministic candidate info extraction used before falling back to the LLM
+import re
+import threading
+from typing import Dict, Optional
+
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+PHONE_PATTERN = r'^\+?1?\d{9,15}$'
+
+# Same patterns as above, unanchored so they can be found inside a message
+EMAIL_SEARCH = re.compile(EMAIL_PATTERN[1:-1])
+PHONE_SEARCH = re.compile(r'\+?\d[\d\s().-]{7,}\d')
+PHONE_SEPARATORS = re.compile(r'[\s().-]')
+EXPERIENCE_SEARCH = re.compile(r'\b(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b', re.IGNORECASE)
+TOKEN_SEARCH = re.compile(r"[a-z0-9+#.-]+")
+
+KNOWN_TECH = {
+    "python": "Python", "java": "Java", "javascript": "JavaScript", "js": "JavaScript",
+    "typescript": "TypeScript", "ts": "TypeScript", "c++": "C++", "c#": "C#", "go": "Go",
+    "golang": "Go", "rust": "Rust", "ruby": "Ruby", "php": "PHP", "kotlin": "Kotlin",
+    "swift": "Swift", "scala": "Scala", "sql": "SQL", "react": "React", "reactjs": "React",
+    "angular": "Angular", "vue": "Vue", "node": "Node.js", "nodejs": "Node.js",
+    "node.js": "Node.js", "django": "Django", "flask": "Flask", "fastapi": "FastAPI",
+    "spring": "Spring", "langchain": "Langchain", "tensorflow": "Tensorflow",
+    "pytorch": "PyTorch", "keras": "Keras", "pandas": "Pandas", "numpy": "NumPy",
+    "scikit-learn": "scikit-learn", "sklearn": "scikit-learn", "docker": "Docker",
+    "kubernetes": "Kubernetes", "k8s": "Kubernetes", "aws": "AWS", "azure": "Azure",
+    "gcp": "GCP", "postgresql": "PostgreSQL", "postgres": "PostgreSQL", "mysql": "MySQL",
+    "mongodb": "MongoDB", "redis": "Redis", "spark": "Spark", "hadoop": "Hadoop",
+    "machine learning": "Machine Learning", "deep learning": "Deep Learning",
+}
+
+KNOWN_LOCATIONS = {
+    "bangalore": "Bangalore", "bengaluru": "Bangalore", "hyderabad": "Hyderabad",
+    "chennai": "Chennai", "mumbai": "Mumbai", "pune": "Pune", "delhi": "Delhi",
+    "new delhi": "New Delhi", "noida": "Noida", "gurgaon": "Gurgaon", "gurugram": "Gurgaon",
+    "kolkata": "Kolkata", "ahmedabad": "Ahmedabad", "kochi": "Kochi", "remote": "Remote",
+    "london": "London", "berlin": "Berlin", "new york": "New York", "san francisco": "San Francisco",
+    "seattle": "Seattle", "toronto": "Toronto", "singapore": "Singapore", "dubai": "Dubai",
+}
+
+# Phrases suggesting the message carries a profile field the local pass can't read
+FIELD_CUES = {
+    "name": re.compile(r"\b(my name|i am|i'm|im|this is|call me)\b", re.IGNORECASE),
+    "position": re.compile(r"\b(role|position|job|engineer|developer|scientist|analyst|manager|intern|architect|designer|lead|apply|applying)\b", re.IGNORECASE),
+    "location": re.compile(r"\b(from|based|live|living|located|city|relocate|stay)\b", re.IGNORECASE),
+    "experience": re.compile(r"\b(years?|yrs?|months?|experience|fresher|graduate)\b", re.IGNORECASE),
+    "tech_stack": re.compile(r"\b(stack|skills?|know|work with|worked with|familiar|proficient|using|languages?|frameworks?|tools?)\b", re.IGNORECASE),
+    "email": re.compile(r"@|\bemail\b", re.IGNORECASE),
+    "phone": re.compile(r"\d{5}|\b(phone|number|mobile|contact)\b", re.IGNORECASE),
+}
+
+ACKNOWLEDGEMENTS = {
+    "yes", "no", "yeah", "yep", "nope", "sure", "ok", "okay", "thanks", "thank you",
+    "cool", "great", "fine", "alright", "sounds good", "go ahead", "ready", "i don't know",
+    "let's go", "lets go", "i'm ready", "ready to go", "i'm ready to go",
+}
+# Acknowledgements separated by punctuation, one pattern so other messages fail on their first characters
+ACKNOWLEDGEMENT_PATTERN = re.compile(
+    r"(?:[,.!;]+\s*)?(?:(?:" + "|".join(re.escape(a) for a in sorted(ACKNOWLEDGEMENTS, key=len, reverse=True)) + r")(?:[,.!;]+\s*|$))+"
+)
+
+# Tech names that are also everyday words ("go ahead", "in the spring"), only
+# taken as tech with a stack cue or alongside other tech in the same message
+AMBIGUOUS_TECH = {"go", "swift", "spring"}
+
+PROFILE_FIELDS = ["name", "email", "phone", "experience", "position", "location", "tech_stack"]
+
+def validate_email(email: str) -> bool:
+    return bool(re.match(EMAIL_PATTERN, email))
+
+def validate_phone(phone: str) -> bool:
+    return bool(re.match(PHONE_PATTERN, phone))
+
+def parse_experience_years(experience) -> Optional[float]:
+    """Years of experience from free text like "2", "1 year" or "2.5 yrs", None if unknown"""
+    if isinstance(experience, (int, float)):
+        return float(experience)
+    if not experience:
+        return None
+    text = str(experience).strip().lower()
+    if "fresher" in text or "no experience" in text:
+        return 0.0
+    match = re.search(r'\d{1,2}(?:\.\d+)?', text)
+    if not match:
+        return None
+    years = float(match.group())
+    return years / 12 if "month" in text and "year" not in text else years
+
+def is_acknowledgement(message: str) -> bool:
+    """Whether the message is only acknowledgements, like "Sure, go ahead" """
+    return ACKNOWLEDGEMENT_PATTERN.fullmatch(message.strip().lower()) is not None
+
+def local_extract(message: str) -> Dict:
+    """Find emails, phones, years of experience, known locations and tech names in a message"""
+    found = {}
+    if is_acknowledgement(message):
+        return found
+
+    email = EMAIL_SEARCH.search(message)
+    if email and validate_email(email.group()):
+        found["email"] = email.group()
+
+    for match in PHONE_SEARCH.finditer(message):
+        phone = PHONE_SEPARATORS.sub('', match.group())
+        if validate_phone(phone):
+            found["phone"] = phone
+            break
+
+    experience = EXPERIENCE_SEARCH.search(message)
+    if experience:
+        years = experience.group(1)
+        found["experience"] = f"{years} year" if years == "1" else f"{years} years"
+
+    # Check two word phrases first, then single words, against the dictionaries
+    tokens = [token.strip('.,') for token in TOKEN_SEARCH.findall(message.lower())]
+    tech_stack = []
+    ambiguous = False
+    i = 0
+    while i < len(tokens):
+        pair = " ".join(tokens[i:i + 2])
+        if i + 1 < len(tokens) and (pair in KNOWN_TECH or pair in KNOWN_LOCATIONS):
+            term = pair
+            i += 2
+        else:
+            term = tokens[i]
+            i += 1
+
+        if term in KNOWN_TECH and KNOWN_TECH[term] not in tech_stack:
+            tech_stack.append(KNOWN_TECH[term])
+            ambiguous = ambiguous or term in AMBIGUOUS_TECH
+        elif term in KNOWN_LOCATIONS and "location" not in found:
+            found["location"] = KNOWN_LOCATIONS[term]
+    if len(tech_stack) == 1 and ambiguous and not FIELD_CUES["tech_stack"].search(message):
+        tech_stack = []
+    if tech_stack:
+        found["tech_stack"] = tech_stack
+
+    return found
+
+def needs_llm_extraction(message: str, current_data: Dict) -> bool:
+    """Whether the message plausibly holds profile fields that are still unfilled"""
+    missing = [field for field in PROFILE_FIELDS if not current_data.get(field)]
+    if not missing:
+        return False
+
+    if is_acknowledgement(message):
+        return False
+    normalized = message.strip().lower().rstrip('.!')
+
+    # A bare short reply early on is most likely the candidate's name
+    if "name" in missing and len(normalized.split()) <= 4:
+        return True
+
+    return any(FIELD_CUES[field].search(message) for field in missing)
+
+class FastPathStats:
+    """Process-wide counters for how often the local extractor saved an LLM call"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.llm_calls = 0
+        self.llm_skipped = 0
+
+    def record(self, local_hit: bool, llm_called: bool):
+        with self._lock:
+            self.local_hits += local_hit
+            if llm_called:
+                self.llm_calls += 1
+            else:
+                self.llm_skipped += 1
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "local_hits": self.local_hits,
+                "llm_calls": self.llm_calls,
+                "llm_skipped": self.llm_skipped,
+            }
+
+fast_path_stats = FastPathStats()
@@ -0,0 +1,400 @@
+# Deterministic stand-in for the Gemini API, in-process or served over local HTTP,
+# for running the interview pipeline offline in load and latency tests
+import argparse
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from context_builder import estimate_tokens
+from extraction import PROFILE_FIELDS, local_extract
+
+FAKE_MODEL_NAME = "models/fake-gemini"
+
+class FakeAPIError(Exception):
+    """Injected failure, standing in for a Gemini API error"""
+
+class LatencyModel:
+    """Samples call latencies from "fixed:S", "uniform:LO,HI", "normal:MEAN,SD" or "lognormal:MU,SIGMA" (seconds)"""
+
+    def __init__(self, spec: str = "fixed:0", rng: Optional[random.Random] = None):
+        self.spec = spec
+        self.rng = rng or random.Random(0)
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        if kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0] if self.params else 0.0
+        if self.kind == "uniform":
+            return self.rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, self.rng.gauss(*self.params))
+        return self.rng.lognormvariate(*self.params)
+
+class FakeResponse:
+    """Mimics a genai response: .text, .usage_metadata and iteration over streamed chunks"""
+
+    def __init__(self, text: str, prompt_tokens: int, chunk_size: int = 24, chunk_delay: float = 0.0):
+        self.text = text
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=estimate_tokens(text),
+            total_token_count=prompt_tokens + estimate_tokens(text),
+        )
+        self._chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)] or [""]
+        self._chunk_delay = chunk_delay
+
+    def __iter__(self):
+        for i, chunk in enumerate(self._chunks):
+            if i and self._chunk_delay:
+                time.sleep(self._chunk_delay)
+            yield SimpleNamespace(text=chunk)
+
+    async def __aiter__(self):
+        for i, chunk in enumerate(self._chunks):
+            if i and self._chunk_delay:
+                await asyncio.sleep(self._chunk_delay)
+            yield SimpleNamespace(text=chunk)
+
+GENERIC_QUESTIONS = [
+    "Can you explain the difference between a list and a tuple in {tech}?",
+    "How do you handle errors and exceptions in {tech}?",
+    "Can you describe a project where you used {tech} and a challenge you solved?",
+    "How would you test a small {tech} application?",
+]
+
+class ScriptedResponder:
+    """Produces plausible replies for each kind of prompt the app sends
+
+    Chat turns follow the context the app sends with every message: ask for the
+    first missing field, then ask three numbered technical questions, then finish
+    with INTERVIEW COMPLETE once they are answered. responses, if given, are
+    returned in order instead (cycling) for fully scripted runs.
+    """
+
+    def __init__(self, responses: Optional[List[str]] = None):
+        self.responses = responses
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str, history: Optional[List[Dict]] = None) -> str:
+        if self.responses:
+            with self._lock:
+                text = self.responses[self._next % len(self.responses)]
+                self._next += 1
+            return text
+        if history is not None:
+            return self.chat_reply(prompt, history)
+        return self.generate_reply(prompt)
+
+    @staticmethod
+    def _message_fields(message: str, asked: Optional[str]) -> Dict:
+        fields = local_extract(message)
+        # A short bare reply nothing else matched is taken as the answer to the field that was asked for
+        if not fields and asked and 0 < len(message.split()) <= 6 and "?" not in message:
+            answer = message.strip().strip(".!")
+            fields[asked] = [tech.strip() for tech in answer.split(",")] if asked == "tech_stack" else answer
+        return fields
+
+    @staticmethod
+    def _asked_field(history: List[Dict]) -> Optional[str]:
+        """Profile field the last assistant turn asked for, if it asked for one"""
+        for entry in reversed(history):
+            if entry["role"] == "model":
+                asked = re.search(r'tell me your ([a-z ]+)\?', "".join(entry["parts"]))
+                field = asked.group(1).replace(" ", "_") if asked else None
+                return field if field in PROFILE_FIELDS else None
+        return None
+
+    def generate_reply(self, prompt: str) -> str:
+        if "extract the following information" in prompt:
+            current = re.search(r'Current data: (.*)', prompt)
+            try:
+                current_data = json.loads(current.group(1)) if current else {}
+            except json.JSONDecodeError:
+                current_data = {}
+            missing = [field for field in PROFILE_FIELDS if not current_data.get(field)]
+            message = prompt.split("Message:", 1)[-1].split("Return only a JSON object", 1)[0].strip()
+            # No conversation comes with the prompt, the data from before this message is the best guess
+            return json.dumps(self._message_fields(message, missing[0] if missing else None))
+        if "JSON array with one object per candidate" in prompt:
+            keys = re.findall(r'^\s*\[(c\d+)\]', prompt, re.MULTILINE)
+            return json.dumps([{"id": key, "summary": "Relevant experience, sound basics, suitable for next round."} for key in keys])
+        if "Evaluate the candidate" in prompt:
+            return "Relevant experience, sound basics, suitable for next round."
+        if "Summarize this part of a screening interview" in prompt:
+            return "The candidate shared their background and answered some technical questions."
+        if "technical screening questions about" in prompt:
+            tech = re.search(r'about (.+?) for a', prompt).group(1)
+            count = int(re.search(r'Write (\d+)', prompt).group(1))
+            return json.dumps([q.format(tech=tech) for q in (GENERIC_QUESTIONS * count)[:count]])
+        if "Write a short rubric" in prompt:
+            return "- Correct core concepts\n- Practical examples\n- Clear reasoning"
+        return "OK"
+
+    def chat_reply(self, message: str, history: Optional[List[Dict]] = None) -> str:
+        if "Begin by introducing yourself" in message:
+            return "Hi! I'm Ash, the hiring assistant at TalentScout. Could you tell me your name?"
+
+        user_message = message.split("User message:", 1)[-1].strip()
+        missing_match = re.search(r'Still missing: (.*)', message)
+        missing = [] if not missing_match or missing_match.group(1).strip() == "nothing" else [f.strip() for f in missing_match.group(1).split(",")]
+        # Still missing is worked out after the app's own extraction, so it may have moved past the field just asked
+        fields = self._message_fields(user_message, self._asked_field(history or []))
+        missing = [field for field in missing if field not in fields]
+
+        progress = re.search(r'Technical questions asked: (\d+), answered: (\d+)', message)
+        asked, answered = (int(progress.group(1)), int(progress.group(2))) if progress else (0, 0)
+        stored = re.findall(r'^\s*\d\. (.+\?)\s*$', message.split("Ask the candidate these technical questions now", 1)[1], re.MULTILINE) \
+            if "Ask the candidate these technical questions now" in message else []
+
+        if missing:
+            reply = f"Thanks for sharing! Could you tell me your {missing[0].replace('_', ' ')}?"
+        elif asked == 0:
+            tech = (fields.get("tech_stack") or ["your main language"])[0]
+            questions = stored or [q.format(tech=tech) for q in GENERIC_QUESTIONS[:3]]
+            reply = "Great, let's move on to a few technical questions:\n" + "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+        elif answered + 1 >= asked:
+            reply = "Thank you for your answers! That's everything I needed. INTERVIEW COMPLETE"
+        else:
+            reply = "Thanks, that's helpful. Please go ahead with the next question."
+
+        if "<candidate_update>" in message:
+            reply += f"\n<candidate_update>{json.dumps({k: v for k, v in fields.items() if k in PROFILE_FIELDS})}</candidate_update>"
+        return reply
+
+class FakeGenerativeModel:
+    """In-process imitation of genai.GenerativeModel
+
+    latency is a LatencyModel spec for time to first token, error_rate the chance
+    each call raises FakeAPIError. Everything is seeded, so runs are reproducible.
+    """
+
+    def __init__(self, model_name: str = FAKE_MODEL_NAME, latency: str = "fixed:0", error_rate: float = 0.0,
+                 seed: int = 0, responder: Optional[Callable] = None, chunk_size: int = 24, chunk_delay: float = 0.0):
+        self.model_name = model_name
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.latency = LatencyModel(latency, self._rng)
+        self.error_rate = error_rate
+        self.responder = responder or ScriptedResponder()
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+
+    def _plan(self) -> float:
+        """Latency for the next call, raising if this call is to fail"""
+        with self._rng_lock:
+            self.calls += 1
+            delay = self.latency.sample()
+            failed = self._rng.random() < self.error_rate
+        if failed:
+            raise FakeAPIError("Injected fake API error")
+        return delay
+
+    def _respond(self, prompt: str, history: Optional[List[Dict]]) -> FakeResponse:
+        text = self.responder(prompt, history)
+        context = "".join(part for entry in history or [] for part in entry["parts"])
+        return FakeResponse(text, estimate_tokens(context + prompt), self.chunk_size, self.chunk_delay)
+
+    def generate_content(self, prompt: str, stream: bool = False, _history: Optional[List[Dict]] = None) -> FakeResponse:
+        time.sleep(self._plan())
+        return self._respond(prompt, _history)
+
+    async def generate_content_async(self, prompt: str, stream: bool = False, _history: Optional[List[Dict]] = None) -> FakeResponse:
+        await asyncio.sleep(self._plan())
+        return self._respond(prompt, _history)
+
+    def start_chat(self, history: Optional[List] = None) -> "FakeChatSession":
+        return FakeChatSession(self, history)
+
+class FakeChatSession:
+    """Imitates genai.ChatSession, keeping history as role/parts dicts
+
+    A streamed reply only joins the history once it has been read, as with genai.
+    """
+
+    def __init__(self, model, history: Optional[List] = None):
+        self.model = model
+        self._history = [self._as_dict(entry) for entry in history or []]
+        self._pending = None
+
+    @property
+    def history(self) -> List[Dict]:
+        if self._pending:
+            message, response = self._pending
+            self._pending = None
+            self._history.append({"role": "user", "parts": [message]})
+            self._history.append({"role": "model", "parts": [response.text]})
+        return self._history
+
+    @staticmethod
+    def _as_dict(entry) -> Dict:
+        if isinstance(entry, dict):
+            return {"role": entry["role"], "parts": [p if isinstance(p, str) else p.text for p in entry["parts"]]}
+        return {"role": entry.role, "parts": [part.text for part in entry.parts]}
+
+    def _record(self, message: str, response):
+        # send_message already read self.history, so any earlier reply is in it
+        self._pending = (message, response)
+
+    def send_message(self, message: str, stream: bool = False):
+        response = self.model.generate_content(message, stream=stream, _history=self.history)
+        self._record(message, response)
+        return response
+
+    async def send_message_async(self, message: str, stream: bool = False):
+        response = await self.model.generate_content_async(message, stream=stream, _history=self.history)
+        self._record(message, response)
+        return response
+
+class HTTPStreamResponse:
+    """Streamed reply from the fake server, chunks are read as they arrive
+
+    Like a genai streaming response, .text is only complete once it has been iterated.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self._chunks: List[str] = []
+        self.usage_metadata = None
+
+    def __iter__(self):
+        with self._response:
+            for line in self._response:
+                if line.strip():
+                    chunk = json.loads(line)
+                    if "usage" in chunk:
+                        self.usage_metadata = SimpleNamespace(**chunk["usage"])
+                        continue
+                    self._chunks.append(chunk["text"])
+                    yield SimpleNamespace(text=chunk["text"])
+
+    async def __aiter__(self):
+        # Each line is a blocking socket read, done off the event loop
+        chunks = iter(self)
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+class HTTPGenerativeModel:
+    """genai.GenerativeModel look-alike that talks to a fake_llm server over HTTP"""
+
+    def __init__(self, base_url: str, model_name: str = FAKE_MODEL_NAME, timeout: float = 60):
+        self.base_url = base_url.rstrip("/")
+        self.model_name = model_name
+        self.timeout = timeout
+
+    def _post(self, path: str, payload: Dict, stream: bool):
+        request = urllib.request.Request(
+            f"{self.base_url}{path}",
+            data=json.dumps(dict(payload, stream=stream)).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            raise FakeAPIError(e.read().decode() or str(e)) from e
+
+        if stream:
+            return HTTPStreamResponse(response)
+        with response:
+            body = json.loads(response.read())
+        return FakeResponse(body["text"], body["usage"]["prompt_token_count"])
+
+    def generate_content(self, prompt: str, stream: bool = False, _history: Optional[List[Dict]] = None):
+        return self._post("/generate", {"prompt": prompt, "history": _history}, stream)
+
+    async def generate_content_async(self, prompt: str, stream: bool = False, _history: Optional[List[Dict]] = None):
+        return await asyncio.to_thread(self.generate_content, prompt, stream, _history)
+
+    def start_chat(self, history: Optional[List] = None) -> FakeChatSession:
+        return FakeChatSession(self, history)
+
+def make_handler(model: FakeGenerativeModel):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            if self.path != "/generate":
+                self.send_error(404)
+                return
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            try:
+                response = model.generate_content(payload["prompt"], _history=payload.get("history"))
+            except FakeAPIError as e:
+                body = str(e).encode()
+                self.send_response(503)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            if not payload.get("stream"):
+                body = json.dumps({"text": response.text, "usage": vars(response.usage_metadata)}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in response:
+                self._write_chunk({"text": chunk.text})
+            self._write_chunk({"usage": vars(response.usage_metadata)})
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _write_chunk(self, payload: Dict):
+            line = (json.dumps(payload) + "\n").encode()
+            self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+def serve(model: FakeGenerativeModel, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Start the fake API server on a background thread and return it"""
+    server = ThreadingHTTPServer((host, port), make_handler(model))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a deterministic fake Gemini API for offline testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="lognormal:-1.5,0.5", help='e.g. "fixed:0.2", "uniform:0.1,0.8", "lognormal:-1.5,0.5"')
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="Seconds between streamed chunks")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = FakeGenerativeModel(latency=args.latency, error_rate=args.error_rate, seed=args.seed, chunk_delay=args.chunk_delay)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(model))
+    print(f"Fake Gemini API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
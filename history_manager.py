@@ -0,0 +1,91 @@
+# Keeps the Gemini chat history bounded by folding old turns into a running summary
+import json
+from typing import Dict, List, Optional
+
+from context_builder import estimate_tokens
+from extraction import PROFILE_FIELDS
+from llm_cache import get_llm_cache
+
+SUMMARY_PROMPT = """
+    Summarize this part of a screening interview for the hiring assistant that runs it.
+    Keep facts about the candidate, technical questions asked and how they were answered,
+    and anything the assistant promised. Leave out greetings and small talk.
+
+    Summary so far: {summary}
+
+    Conversation to add:
+    {transcript}
+
+    Return only the updated summary, at most 150 words.
+    """
+
+def content_role(content) -> str:
+    return content["role"] if isinstance(content, dict) else content.role
+
+def content_text(content) -> str:
+    """Plain text of a history entry, either a genai Content or a role/parts dict"""
+    parts = content["parts"] if isinstance(content, dict) else content.parts
+    return "".join(part if isinstance(part, str) else getattr(part, "text", "") for part in parts)
+
+class HistoryManager:
+    """Keeps the last max_turns turns verbatim and folds older ones into a running summary
+
+    The first turn (system prompt and greeting) is always kept. The summary and the
+    structured candidate data go into a pinned turn right after it. With max_tokens
+    set, older turns are also folded while the history is over that estimate.
+    """
+
+    def __init__(self, max_turns: int = 8, max_tokens: Optional[int] = None, batch: int = 4):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        # Fold several turns at once so the summary call isn't made every turn
+        self.batch = batch
+        self.summary = ""
+
+    def _split(self, history: List) -> tuple:
+        """Split history into the pinned prompt turn, the old summary turn and the rest"""
+        pinned = list(history[:2])
+        rest = list(history[2:])
+        if self.summary and len(rest) >= 2 and content_text(rest[0]).startswith("Summary of the earlier conversation"):
+            rest = rest[2:]
+        return pinned, rest
+
+    def _turns_to_fold(self, turns: List) -> int:
+        count = len(turns) // 2
+        fold = 0
+        if count > self.max_turns + self.batch:
+            fold = count - self.max_turns
+        if self.max_tokens:
+            sizes = [estimate_tokens(content_text(turns[i])) + estimate_tokens(content_text(turns[i + 1])) for i in range(0, len(turns) - 1, 2)]
+            total = sum(sizes)
+            over = 0
+            while over < count - 1 and total > self.max_tokens:
+                total -= sizes[over]
+                over += 1
+            fold = max(fold, over)
+        return fold
+
+    def compact(self, chat, candidate_data: Dict):
+        """Return chat, or a new chat session with the older turns folded into the summary"""
+        pinned, turns = self._split(chat.history)
+        fold = self._turns_to_fold(turns)
+        if not fold:
+            return chat
+
+        old, recent = turns[:fold * 2], turns[fold * 2:]
+        transcript = "\n".join(f"{content_role(content)}: {content_text(content)}" for content in old)
+        try:
+            prompt = SUMMARY_PROMPT.format(summary=self.summary or "none", transcript=transcript)
+            response = get_llm_cache().generate(chat.model, prompt, "history_summary")
+            self.summary = response.text.strip()
+        except Exception:
+            # Keep the full history rather than losing turns without a summary
+            return chat
+
+        profile = {field: candidate_data.get(field) for field in PROFILE_FIELDS}
+        summary_turn = [
+            {"role": "user", "parts": [f"Summary of the earlier conversation: {self.summary}\nCandidate data: {json.dumps(profile)}"]},
+            {"role": "model", "parts": ["Understood, I'll continue the interview from here."]},
+        ]
+        history = [{"role": content_role(content), "parts": [content_text(content)]} for content in pinned + recent]
+        return chat.model.start_chat(history=history[:2] + summary_turn + history[2:])
@@ -0,0 +1,683 @@
+# Interview engine and turn helpers shared by the Streamlit app and headless drivers, free of Streamlit
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from candidate import CandidateProfile, Transcript
+from context_builder import build_turn_context
+from extraction import local_extract, needs_llm_extraction, fast_path_stats
+from history_manager import HistoryManager
+from jobs import FAILED, Job, complete_interview, get_job_queue, submit_interview
+from llm_cache import get_llm_cache, model_name
+from metrics import get_metrics
+from persistence import clean_candidate_data
+from question_bank import get_question_bank
+from semantic_cache import get_semantic_cache
+
+logger = logging.getLogger(__name__)
+
+# "single" asks the chat model for the reply and the new candidate fields in one
+# call, "serial" runs a separate extraction call before the reply and
+# "concurrent" runs the extraction call alongside the reply
+TURN_MODE = os.getenv("TALENTSCOUT_TURN_MODE", "single")
+
+# Upper bound on the candidate data sent with each turn, the chat history has the rest
+CONTEXT_BUDGET_BYTES = int(os.getenv("TALENTSCOUT_CONTEXT_BUDGET_BYTES", "1200"))
+
+# Chat turns kept verbatim, older ones are folded into a running summary.
+# A non-zero token budget also folds turns while the history is over it
+HISTORY_MAX_TURNS = int(os.getenv("TALENTSCOUT_HISTORY_TURNS", "8"))
+HISTORY_MAX_TOKENS = int(os.getenv("TALENTSCOUT_HISTORY_TOKENS", "0")) or None
+
+# Once a session or the day is over its token budget: the model front ends switch
+# to (empty to keep the current one) and the chat turns kept verbatim
+BUDGET_MODEL = os.getenv("TALENTSCOUT_BUDGET_MODEL", "")
+BUDGET_HISTORY_TURNS = int(os.getenv("TALENTSCOUT_BUDGET_HISTORY_TURNS", "2"))
+
+CANDIDATE_UPDATE_START = "<candidate_update>"
+CANDIDATE_UPDATE_END = "</candidate_update>"
+
+STRUCTURED_REPLY_INSTRUCTIONS = f"""
+            After your reply, append any NEW candidate information found in the user message as a JSON object wrapped in {CANDIDATE_UPDATE_START}...{CANDIDATE_UPDATE_END}.
+            Use only these keys: name, email, phone, experience, position, location, tech_stack.
+            Leave out fields that aren't in the message. If nothing new was shared, return {CANDIDATE_UPDATE_START}{{}}{CANDIDATE_UPDATE_END}.
+            Never mention this block in your reply."""
+
+STORED_QUESTIONS_INSTRUCTIONS = """
+            Ask the candidate these technical questions now, numbered 1., 2., 3. You may phrase them conversationally but keep their meaning:
+            {questions}"""
+
+def extract_candidate_info(model, message: str, current_data: Dict, local_info: Dict) -> Dict:
+    """Candidate fields the model finds in message, {} when the local matches leave nothing to ask it for
+
+    local_info is local_extract(message), already merged into current_data.
+    Raises on API errors and unparseable replies.
+    """
+    if not needs_llm_extraction(message, current_data):
+        fast_path_stats.record(local_hit=bool(local_info), llm_called=False)
+        return {}
+    fast_path_stats.record(local_hit=bool(local_info), llm_called=True)
+
+    response = get_llm_cache().generate(model, extraction_prompt(message, current_data), "extraction")
+    return json.loads(response.text)
+
+async def extract_candidate_info_async(model, message: str, current_data: Dict, local_info: Dict) -> Dict:
+    """extract_candidate_info, awaiting the model instead of blocking on it"""
+    if not needs_llm_extraction(message, current_data):
+        fast_path_stats.record(local_hit=bool(local_info), llm_called=False)
+        return {}
+    fast_path_stats.record(local_hit=bool(local_info), llm_called=True)
+
+    response = await get_llm_cache().generate_async(model, extraction_prompt(message, current_data), "extraction")
+    return json.loads(response.text)
+
+def extraction_prompt(message: str, current_data: Dict) -> str:
+    return f"""
+    From this conversation message, extract the following information if present:
+    1. Name
+    2. Email
+    3. Phone
+    4. Years of experience
+    5. Position/role they're applying for
+    6. Location
+    7. Tech stack/skills mentioned
+
+    Current data: {json.dumps(current_data)}
+    Message: {message}
+
+    Return only a JSON object with any new information found. If a field isn't found in the message, don't include it in the JSON.
+    """
+
+def split_structured_reply(response: str) -> Tuple[str, Dict]:
+    """Split a single-call response into the visible reply and the candidate update block"""
+    start = response.rfind(CANDIDATE_UPDATE_START)
+    if start == -1:
+        return response.strip(), {}
+
+    end = response.find(CANDIDATE_UPDATE_END, start)
+    block = response[start + len(CANDIDATE_UPDATE_START):end if end != -1 else len(response)]
+    tail = response[end + len(CANDIDATE_UPDATE_END):] if end != -1 else ""
+    reply = (response[:start] + tail).strip()
+
+    # Models sometimes wrap the JSON in a markdown fence
+    block = block.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+    try:
+        new_info = json.loads(block) if block else {}
+    except json.JSONDecodeError:
+        new_info = {}
+
+    return reply, new_info if isinstance(new_info, dict) else {}
+
+# A numbered item at the start of a line ("1. ", "2) ", "**3.** ", "4.What"), and one
+# following a question on the same line. Without a space the number must be followed by
+# a letter, so numbers inside text ("Python 3.10", "2.5 years") don't match
+ITEM_NUMBER = r'(?:\*\*)?\d{1,3}[.)](?:\*\*)?(?:\s+|(?=[A-Za-z*]))'
+QUESTION_START = re.compile(r'\s*' + ITEM_NUMBER)
+INLINE_QUESTION_START = re.compile(r'(?<=\?)\s*' + ITEM_NUMBER)
+
+def question_key(question: str) -> str:
+    """Case and whitespace insensitive key for spotting repeated questions"""
+    return " ".join(question.casefold().split())
+
+class QuestionParser:
+    """Single pass, line oriented parser for the numbered questions in a reply
+
+    Feed it the whole reply or streamed chunks in order, each question is
+    returned once its item is complete. An item runs from its number until the
+    next numbered line, a blank line, or the first line after it has a question
+    mark, and is cut after its last question mark so trailing text like
+    "INTERVIEW COMPLETE" stays out. Questions whose key is in known, or already
+    returned, are skipped.
+    """
+
+    def __init__(self, known=()):
+        self._seen = {question_key(question) for question in known}
+        self._partial: List[str] = []
+        self._item: Optional[List[str]] = None
+        self._item_has_question = False
+
+    def feed(self, chunk: str) -> List[str]:
+        if "\n" not in chunk:
+            self._partial.append(chunk)
+            return []
+        head, *middle, tail = chunk.split("\n")
+        self._partial.append(head)
+        lines = ["".join(self._partial)] + middle
+        self._partial = [tail]
+
+        questions = []
+        for line in lines:
+            questions.extend(self._line(line))
+        return questions
+
+    def close(self) -> List[str]:
+        """Questions from the rest of the reply, call once after the last chunk"""
+        questions = self._line("".join(self._partial))
+        self._partial = []
+        return questions + self._finish_item()
+
+    def _line(self, line: str) -> List[str]:
+        match = QUESTION_START.match(line)
+        if match:
+            questions = self._finish_item()
+            self._item = [line[match.end():]]
+            self._item_has_question = "?" in line
+            return questions
+        if self._item is not None and line.strip() and not self._item_has_question:
+            # A question wrapped over several lines
+            self._item.append(line)
+            self._item_has_question = "?" in line
+            return []
+        return self._finish_item()
+
+    def _finish_item(self) -> List[str]:
+        if self._item is None:
+            return []
+        text = " ".join(self._item)
+        self._item = None
+
+        questions = []
+        for piece in INLINE_QUESTION_START.split(text):
+            end = piece.rfind("?")
+            if end == -1:
+                continue
+            question = " ".join(piece[:end + 1].replace("**", "").split())
+            key = question_key(question)
+            if question and key not in self._seen:
+                self._seen.add(key)
+                questions.append(question)
+        return questions
+
+def extract_tech_questions(response: str, known=()) -> list:
+    """Extract technical questions from AI response, leaving out any already in known"""
+    parser = QuestionParser(known)
+    return parser.feed(response) + parser.close()
+
+class ReplyFilter:
+    """Splits streamed reply text into what the candidate sees, holding back the update block"""
+
+    def __init__(self):
+        self._pending = ""
+        self._hidden = False
+
+    def feed(self, text: str) -> str:
+        """Visible text that can be shown now"""
+        if self._hidden:
+            return ""
+        self._pending += text
+        marker = self._pending.find(CANDIDATE_UPDATE_START)
+        if marker != -1:
+            # Everything from the update block onwards is for the app, not the candidate
+            self._hidden = True
+            visible, self._pending = self._pending[:marker], ""
+            return visible
+
+        # Hold back a tail that could be the start of the update block marker
+        keep = next((n for n in range(len(CANDIDATE_UPDATE_START) - 1, 0, -1) if self._pending.endswith(CANDIDATE_UPDATE_START[:n])), 0)
+        split = len(self._pending) - keep
+        visible, self._pending = self._pending[:split], self._pending[split:]
+        return visible
+
+    def flush(self) -> str:
+        """Visible text held back, call once after the last chunk"""
+        visible, self._pending = self._pending, ""
+        return "" if self._hidden else visible
+
+def stream_reply_text(response, chunks: list):
+    """Yield the visible reply text of a streamed response, collecting every chunk in chunks"""
+    reply_filter = ReplyFilter()
+    for chunk in response:
+        chunks.append(chunk.text)
+        visible = reply_filter.feed(chunk.text)
+        if visible:
+            yield visible
+    visible = reply_filter.flush()
+    if visible:
+        yield visible
+
+async def stream_reply_text_async(response, chunks: list):
+    """stream_reply_text for a response read with async for"""
+    reply_filter = ReplyFilter()
+    async for chunk in response:
+        chunks.append(chunk.text)
+        visible = reply_filter.feed(chunk.text)
+        if visible:
+            yield visible
+    visible = reply_filter.flush()
+    if visible:
+        yield visible
+
+def format_stored_questions(questions: list) -> str:
+    """Context addition asking the model to put stored questions to the candidate"""
+    return STORED_QUESTIONS_INSTRUCTIONS.format(
+        questions="\n            ".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+    )
+
+def get_initial_prompt() -> str:
+    return """You are an AI Hiring Assistant for TalentScout, a technology recruitment agency. Your name is Ash. You conduct initial screening interviews with candidates in a friendly, conversational manner. Your personality traits:
+
+1. Professional yet warm and approachable
+2. Patient and understanding
+3. Clear communicator
+4. Able to keep conversations on track while being natural
+
+Your goals during the conversation:
+1. Collect candidate information: name, email, phone, experience, desired position, location, and tech stack
+2. Ask relevant technical questions based on their tech stack
+3. Maintain a natural conversation flow while gathering required information
+4. Answer any questions about the company or process
+5. Keep technical questions simple and straightforward
+
+Important rules:
+1. Stay in character as Alex the hiring assistant
+2. When asking technical questions, always number them (1., 2., 3.)
+3. Maintain context and remember information shared
+4. If you detect an email or phone number in responses, validate their format
+5. Generate 3 basic technical questions based on their tech stack when appropriate
+6. After collecting all technical responses, indicate "INTERVIEW COMPLETE" in your response
+7. Make sure to collect specific years of experience and clear position title
+
+Always be conversational and natural, while subtly guiding the conversation to gather required information.
+
+Begin by introducing yourself and asking for the candidate's name."""
+
+def share_questions(profile: CandidateProfile, questions: List[str]):
+    """Cache questions for later candidates on a similar stack, logging rather than raising when the write fails"""
+    try:
+        get_semantic_cache().add("questions", profile.tech_stack, profile.experience, questions)
+    except Exception:
+        # The reply has already reached the candidate, a lost cache entry must not fail the turn
+        logger.exception("Could not cache questions for %s", profile.tech_stack)
+
+class TurnResult:
+    """What one candidate message led to"""
+
+    def __init__(self):
+        self.reply = ""
+        self.questions: List[str] = []
+        self.completed = False
+        self.errors: List[str] = []
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_turn_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for LLM calls that run alongside the chat reply"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=int(os.getenv("TALENTSCOUT_TURN_WORKERS", "8")), thread_name_prefix="talentscout-turn")
+        return _executor
+
+class InterviewSession:
+    """One screening interview: candidate data, chat history, question and answer tracking, completion
+
+    Front ends only pass messages in and show replies. handle_turn and
+    handle_turn_async run a whole turn, stream_turn and stream_turn_async yield
+    the visible reply as it arrives and leave the outcome in last_turn. With a
+    token ledger, a session over its budget switches to single-call turns,
+    shorter context and budget_model, when given.
+
+    The profile and transcript are kept as slotted records. candidate_data and
+    state() build the dict forms the checkpoint log, storage and API use.
+    """
+
+    def __init__(self, model, session_id: str = "", turn_mode: str = TURN_MODE, stream: bool = True,
+                 context_budget: int = CONTEXT_BUDGET_BYTES, history_turns: int = HISTORY_MAX_TURNS,
+                 history_tokens: Optional[int] = HISTORY_MAX_TOKENS, use_stored_questions: bool = True,
+                 ledger=None, budget_model=None, executor: Optional[ThreadPoolExecutor] = None):
+        self.model = model
+        self.session_id = session_id
+        self.turn_mode = turn_mode
+        self.stream = stream
+        self.context_budget = context_budget
+        self.use_stored_questions = use_stored_questions
+        self.ledger = ledger
+        self.budget_model = budget_model
+        self.executor = executor
+        self.history_manager = HistoryManager(history_turns, history_tokens)
+        self.profile = CandidateProfile()
+        self.messages = Transcript()
+        self.chat = None
+        self.context_snapshot: Dict = {}
+        self.question_source = ""
+        self.interview_complete = False
+        self.save_job: Optional[str] = None
+        self.downgraded = False
+        self.last_turn: Optional[TurnResult] = None
+        self._stored_questions: Tuple[list, str] = ([], "")
+
+    @property
+    def candidate_data(self) -> Dict:
+        """The profile as a candidate data dict, a copy"""
+        return self.profile.to_dict()
+
+    def state(self) -> Dict:
+        """Transcript, candidate data, completion and save job in the checkpoint state format"""
+        return {
+            "messages": self.messages.to_dicts(),
+            "candidate_data": self.candidate_data,
+            "interview_complete": self.interview_complete,
+            "save_job": self.save_job,
+        }
+
+    def restore(self, messages: List[Dict], candidate_data: Dict, interview_complete: bool = False,
+                save_job: Optional[str] = None):
+        """Carry on an interview from a saved transcript and candidate data
+
+        A save job this process doesn't know, from before a restart, is queued
+        again, so save_job may differ from the one passed in.
+        """
+        self.messages = Transcript.from_dicts(messages)
+        self.profile = CandidateProfile.from_dict(candidate_data)
+        self.interview_complete = interview_complete
+        self.save_job = save_job
+        history = [{"role": "user", "parts": [get_initial_prompt()]}]
+        history += [
+            {"role": "model" if message["role"] == "assistant" else "user", "parts": [message["content"]]}
+            for message in messages
+        ]
+        self.chat = self.model.start_chat(history=history)
+        if save_job:
+            self.submit()
+
+    def _cached_greeting(self) -> Tuple[str, Optional[str]]:
+        # Every session sends the same opening prompt, so the first reply can be shared
+        prompt = get_initial_prompt()
+        cache = get_llm_cache()
+        key = cache.key(model_name(self.model), prompt)
+        greeting = cache.get(key, "greeting")
+        if greeting is not None:
+            self.chat = self.model.start_chat(history=[
+                {"role": "user", "parts": [prompt]},
+                {"role": "model", "parts": [greeting]},
+            ])
+        else:
+            self.chat = self.model.start_chat(history=[])
+        return key, greeting
+
+    def stream_start(self):
+        """Open the interview, yielding the greeting as it arrives"""
+        key, greeting = self._cached_greeting()
+        if greeting is None:
+            chunks = []
+            with get_metrics().llm_call("chat"):
+                yield from self._send(get_initial_prompt(), chunks)
+            greeting = "".join(chunks)
+            get_llm_cache().put(key, greeting)
+        else:
+            yield greeting
+        self.messages.append("assistant", greeting)
+
+    async def stream_start_async(self):
+        key, greeting = await asyncio.to_thread(self._cached_greeting)
+        if greeting is None:
+            chunks = []
+            with get_metrics().llm_call("chat"):
+                async for visible in self._send_async(get_initial_prompt(), chunks):
+                    yield visible
+            greeting = "".join(chunks)
+            await asyncio.to_thread(get_llm_cache().put, key, greeting)
+        else:
+            yield greeting
+        self.messages.append("assistant", greeting)
+
+    def start(self) -> str:
+        """Open the interview and return the greeting"""
+        for _ in self.stream_start():
+            pass
+        return self.messages[-1].content
+
+    async def start_async(self) -> str:
+        async for _ in self.stream_start_async():
+            pass
+        return self.messages[-1].content
+
+    def _send(self, message: str, chunks: list):
+        if self.stream:
+            yield from stream_reply_text(self.chat.send_message(message, stream=True), chunks)
+            return
+        response = self.chat.send_message(message)
+        chunks.append(response.text)
+        yield split_structured_reply(response.text)[0]
+
+    async def _send_async(self, message: str, chunks: list):
+        if self.stream:
+            async for visible in stream_reply_text_async(await self.chat.send_message_async(message, stream=True), chunks):
+                yield visible
+            return
+        response = await self.chat.send_message_async(message)
+        chunks.append(response.text)
+        yield split_structured_reply(response.text)[0]
+
+    @property
+    def current_turn_mode(self) -> str:
+        # Over budget, extraction rides along with the reply instead of costing a call of its own
+        return "single" if self.downgraded else self.turn_mode
+
+    def downgrade(self):
+        """Cut this interview back to shorter prompts, and the budget model if set, once over its token budget"""
+        self.downgraded = True
+        if self.budget_model is not None:
+            self.model = self.budget_model
+        self.history_manager.max_turns = min(self.history_manager.max_turns, BUDGET_HISTORY_TURNS)
+        self.chat = self.history_manager.compact(self.model.start_chat(history=self.chat.history), self.candidate_data)
+
+    def _check_budget(self):
+        if self.ledger is not None and not self.downgraded and self.ledger.over_budget(self.session_id):
+            self.downgrade()
+
+    def _extract(self, user_input: str, data: Dict, local_info: Dict, result: TurnResult) -> Dict:
+        # Carry on with what is known, the front end shows the error
+        try:
+            return extract_candidate_info(self.model, user_input, data, local_info)
+        except Exception as e:
+            result.errors.append(f"Error extracting candidate info: {str(e)}")
+            return {}
+
+    async def _extract_async(self, user_input: str, data: Dict, local_info: Dict, result: TurnResult) -> Dict:
+        try:
+            return await extract_candidate_info_async(self.model, user_input, data, local_info)
+        except Exception as e:
+            result.errors.append(f"Error extracting candidate info: {str(e)}")
+            return {}
+
+    def _wants_stored_questions(self) -> bool:
+        profile = self.profile
+        return self.use_stored_questions and bool(profile.tech_stack) and not profile.questions and not self.question_source
+
+    def pick_stored_questions(self) -> Tuple[list, str]:
+        """Questions from the precomputed bank, or ones asked before for a similar stack
+
+        Only once the tech stack is known and no questions were asked yet. Returns
+        the questions and where they came from.
+        """
+        profile = self.profile
+        if not self._wants_stored_questions():
+            return [], ""
+
+        bank = get_question_bank()
+        questions = bank.pick(profile.tech_stack, profile.experience, seed=profile.name or profile.email or "") if bank else []
+        if questions:
+            return questions, "bank"
+
+        questions = get_semantic_cache().lookup("questions", profile.tech_stack, profile.experience)
+        return (questions, "cache") if questions else ([], "")
+
+    def _build_message(self, user_input: str) -> str:
+        with get_metrics().time_stage("context_build", self.session_id):
+            context, self.context_snapshot = build_turn_context(
+                self.candidate_data,
+                self.context_snapshot,
+                self.context_budget // 2 if self.downgraded else self.context_budget
+            )
+            if self._stored_questions[0]:
+                context += format_stored_questions(self._stored_questions[0])
+            if self.current_turn_mode == "single":
+                context += STRUCTURED_REPLY_INSTRUCTIONS
+        return f"{context}\n\nUser message: {user_input}"
+
+    def _record_reply(self, user_input: str, reply: str, result: TurnResult) -> List[str]:
+        """Questions, answers and transcript for the full reply text
+
+        Returns the model's first set of questions when they should be shared
+        with later candidates, the caller writes them to the semantic cache.
+        """
+        metrics = get_metrics()
+        profile = self.profile
+        shared = []
+        with metrics.time_stage("question_parsing", self.session_id):
+            if self.current_turn_mode == "single":
+                reply, new_info = split_structured_reply(reply)
+                profile.merge(new_info)
+
+            # Stored questions are recorded as written, not as the model rephrased them, also on the turn they are asked
+            offered = bool(self._stored_questions[0])
+            questions = extract_tech_questions(reply, profile.questions) if self.question_source in ("", "model") and not offered else []
+            if questions:
+                if not self.question_source:
+                    if self.use_stored_questions:
+                        # Share the model's first set of questions with later candidates on a similar stack
+                        shared = questions
+                    self.question_source = "model"
+
+        with metrics.time_stage("answer_bookkeeping", self.session_id):
+            # The message answers the questions asked before this reply, not the ones in it
+            profile.add_answer(user_input)
+            profile.questions.extend(questions)
+
+            stored_questions, stored_source = self._stored_questions
+            if stored_questions:
+                profile.questions.extend(stored_questions)
+                self.question_source = stored_source
+            self._stored_questions = ([], "")
+
+            self.messages.append("assistant", reply)
+
+        result.reply = reply
+        result.questions = questions + stored_questions
+        return shared
+
+    def _complete(self, result: TurnResult):
+        if "INTERVIEW COMPLETE" in result.reply and not self.interview_complete:
+            self.interview_complete = True
+            result.completed = True
+        self.last_turn = result
+
+    def stream_turn(self, user_input: str):
+        """Run a turn for user_input, yielding the visible reply as it arrives"""
+        metrics = get_metrics()
+        result = TurnResult()
+        self.messages.append("user", user_input)
+        self._check_budget()
+        turn_mode = self.current_turn_mode
+
+        extraction = None
+        with metrics.time_stage("extraction", self.session_id):
+            # Local matches first in every mode, in single mode the reply call extracts the rest
+            local_info = local_extract(user_input)
+            self.profile.merge(local_info, local=True)
+            if turn_mode == "serial":
+                self.profile.merge(self._extract(user_input, self.candidate_data, local_info, result))
+            elif turn_mode == "concurrent":
+                # The reply is built without the model's fields, they show up next turn
+                extraction = (self.executor or get_turn_executor()).submit(
+                    self._extract, user_input, self.candidate_data, local_info, result
+                )
+            else:
+                # No separate extraction call in single mode, counted as one the local pass saved
+                fast_path_stats.record(local_hit=bool(local_info), llm_called=False)
+
+        self._stored_questions = self.pick_stored_questions()
+        message = self._build_message(user_input)
+        chunks = []
+        with metrics.time_stage("send_message", self.session_id), metrics.llm_call("chat"):
+            yield from self._send(message, chunks)
+
+        if extraction is not None:
+            # Only the part of the extraction call that outlasted the reply
+            with metrics.time_stage("extraction_wait", self.session_id):
+                self.profile.merge(extraction.result())
+
+        shared = self._record_reply(user_input, "".join(chunks), result)
+        if shared:
+            share_questions(self.profile, shared)
+        with metrics.time_stage("history_compaction", self.session_id):
+            self.chat = self.history_manager.compact(self.chat, self.candidate_data)
+        self._complete(result)
+
+    async def stream_turn_async(self, user_input: str):
+        """stream_turn without blocking the event loop on model calls or the ledger"""
+        metrics = get_metrics()
+        result = TurnResult()
+        self.messages.append("user", user_input)
+        await asyncio.to_thread(self._check_budget)
+        turn_mode = self.current_turn_mode
+
+        extraction = None
+        with metrics.time_stage("extraction", self.session_id):
+            local_info = local_extract(user_input)
+            self.profile.merge(local_info, local=True)
+            if turn_mode == "serial":
+                self.profile.merge(await self._extract_async(user_input, self.candidate_data, local_info, result))
+            elif turn_mode == "concurrent":
+                extraction = asyncio.create_task(self._extract_async(user_input, self.candidate_data, local_info, result))
+            else:
+                fast_path_stats.record(local_hit=bool(local_info), llm_called=False)
+
+        if self._wants_stored_questions():
+            # The semantic cache lookup can wait on its lock or its first load from disk
+            self._stored_questions = await asyncio.to_thread(self.pick_stored_questions)
+        message = self._build_message(user_input)
+        chunks = []
+        with metrics.time_stage("send_message", self.session_id), metrics.llm_call("chat"):
+            async for visible in self._send_async(message, chunks):
+                yield visible
+
+        if extraction is not None:
+            with metrics.time_stage("extraction_wait", self.session_id):
+                self.profile.merge(await extraction)
+
+        shared = self._record_reply(user_input, "".join(chunks), result)
+        if shared:
+            await asyncio.to_thread(share_questions, self.profile, shared)
+        with metrics.time_stage("history_compaction", self.session_id):
+            self.chat = await asyncio.to_thread(self.history_manager.compact, self.chat, self.candidate_data)
+        self._complete(result)
+
+    def handle_turn(self, user_input: str) -> TurnResult:
+        """Run a turn for user_input to the end"""
+        for _ in self.stream_turn(user_input):
+            pass
+        return self.last_turn
+
+    async def handle_turn_async(self, user_input: str) -> TurnResult:
+        async for _ in self.stream_turn_async(user_input):
+            pass
+        return self.last_turn
+
+    def submit(self) -> str:
+        """Queue evaluation and saving of the interview, returns the job id to poll
+
+        Queued once, and again only when the job failed or the job queue lost it,
+        which it does across restarts as it only lives in this process.
+        """
+        job = get_job_queue().status(self.save_job) if self.save_job else None
+        if job is None or job["status"] == FAILED:
+            self.save_job = submit_interview(self.candidate_data, self.model, self.session_id)
+        return self.save_job
+
+    def finish(self, store=None) -> str:
+        """Evaluate and save the interview on this thread, returning where it was saved
+
+        A failed evaluation is noted and the interview saved without it, as the
+        background job does on its last attempt.
+        """
+        job = Job("inline", max_attempts=1)
+        job.attempts = 1
+        return complete_interview(job, clean_candidate_data(self.candidate_data), self.model, self.session_id, store)
@@ -0,0 +1,125 @@
+# In-process background queue that evaluates and saves finished interviews
+import copy
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from evaluation import can_evaluate, evaluate_candidate
+from metrics import get_metrics
+from persistence import clean_candidate_data
+from storage import get_store
+from token_ledger import get_token_ledger
+
+QUEUED = "queued"
+RUNNING = "running"
+RETRYING = "retrying"
+DONE = "done"
+FAILED = "failed"
+
+class Job:
+    """State of one background job, read by the UI while a worker updates it"""
+
+    def __init__(self, job_id: str, max_attempts: int):
+        self.id = job_id
+        self.status = QUEUED
+        self.step = ""
+        self.attempts = 0
+        self.max_attempts = max_attempts
+        self.result = None
+        self.error = ""
+
+    @property
+    def last_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+    def as_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "step": self.step,
+            "attempts": self.attempts,
+            "result": self.result,
+            "error": self.error,
+        }
+
+class JobQueue:
+    """Runs jobs on a small worker pool, retrying failures with exponential backoff"""
+
+    def __init__(self, workers: int = 2, max_attempts: int = 3, backoff: float = 1.0):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="talentscout-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+
+    def submit(self, fn: Callable, *args, max_attempts: Optional[int] = None) -> str:
+        """Queue fn(job, *args) and return the job id to poll"""
+        job = Job(uuid.uuid4().hex, max_attempts or self.max_attempts)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, fn, args)
+        return job.id
+
+    def _run(self, job: Job, fn: Callable, args: tuple):
+        while True:
+            job.attempts += 1
+            job.status = RUNNING
+            job.error = ""
+            try:
+                job.result = fn(job, *args)
+                job.status = DONE
+                return
+            except Exception as e:
+                job.error = str(e)
+                if job.last_attempt:
+                    job.status = FAILED
+                    return
+                job.status = RETRYING
+                get_metrics().retries.inc()
+                time.sleep(self.backoff * 2 ** (job.attempts - 1))
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Snapshot of a job's state, or None for an unknown id"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job.as_dict() if job else None
+
+def complete_interview(job: Job, data: Dict, model, session: str = "", store=None) -> str:
+    """Evaluate a finished interview if needed and save it to store, the configured one by default, returning where it was saved"""
+    metrics = get_metrics()
+    if not data["evaluation_summary"] and can_evaluate(data):
+        job.step = "evaluating"
+        try:
+            with metrics.time_stage("evaluation", session):
+                data["evaluation_summary"] = evaluate_candidate(model, data)
+        except Exception as e:
+            if not job.last_attempt:
+                raise
+            # Out of retries, save without the evaluation rather than lose the interview
+            job.error = f"Evaluation failed: {str(e)}"
+
+    if session:
+        # Totals so far, the evaluation included, go in the record
+        data["token_usage"] = get_token_ledger().session_totals(session)
+
+    job.step = "saving"
+    with metrics.time_stage("save", session):
+        return (store or get_store()).save(data)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Process-wide job queue, created on first use"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(workers=int(os.getenv("TALENTSCOUT_JOB_WORKERS", "2")))
+        return _queue
+
+def submit_interview(data: Dict, model, session: str = "") -> str:
+    """Queue evaluation and saving of a finished interview, returns the job id"""
+    return get_job_queue().submit(complete_interview, clean_candidate_data(copy.deepcopy(data)), model, session)
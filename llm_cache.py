@@ -0,0 +1,205 @@
+# Content-addressed cache for LLM responses: in-memory LRU in front of a SQLite tier
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Dict, Optional
+
+from metrics import get_metrics
+
+DEFAULT_CACHE_PATH = "llm_cache.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses(accessed_at);
+"""
+
+class CachedResponse:
+    """Stands in for a genai response when the text came from the cache"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __iter__(self):
+        # A cached reply "streams" as a single chunk
+        yield self
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompt with whitespace runs collapsed, so indentation changes don't miss the cache"""
+    return " ".join(prompt.split())
+
+def model_name(model) -> str:
+    return getattr(model, "model_name", type(model).__name__)
+
+class LLMCache:
+    """Size-bounded LRU cache of response texts keyed by model and prompt hash
+
+    Recent entries are kept in memory (max_entries), everything else in SQLite up
+    to max_disk_bytes, evicting the least recently used rows first. Every entry
+    has a TTL. Hits and misses are counted per call site.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 1000,
+                 max_disk_bytes: int = 50 * 1024 * 1024, ttl: float = 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def key(model_id: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model_id}\0{normalize_prompt(prompt)}".encode()).hexdigest()
+
+    def _count(self, call_site: str, outcome: str):
+        with self._lock:
+            site = self._stats.setdefault(call_site, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+            site[outcome] += 1
+
+    def _remember(self, key: str, text: str, expires_at: float):
+        with self._lock:
+            self._memory[key] = (text, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str, call_site: str = "default") -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[1] > now:
+                self._memory.move_to_end(key)
+            elif entry:
+                del self._memory[key]
+                entry = None
+        if entry:
+            self._count(call_site, "memory_hits")
+            return entry[0]
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT text, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and row[1] <= now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            elif row:
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        if not row:
+            self._count(call_site, "misses")
+            return None
+
+        self._remember(key, row[0], row[1])
+        self._count(call_site, "disk_hits")
+        return row[0]
+
+    def put(self, key: str, text: str, ttl: Optional[float] = None):
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else self.ttl)
+        self._remember(key, text, expires_at)
+
+        size = len(text.encode("utf-8"))
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, text, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, text, size, expires_at, now),
+            )
+            conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_disk_bytes:
+                # Drop least recently used rows until back under the limit
+                excess = total - self.max_disk_bytes
+                for row_key, row_size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                    if excess <= 0:
+                        break
+                    conn.execute("DELETE FROM responses WHERE key = ?", (row_key,))
+                    excess -= row_size
+
+    def stats(self) -> Dict[str, Dict]:
+        """Hits, misses and hit rate per call site"""
+        with self._lock:
+            result = {}
+            for call_site, site in self._stats.items():
+                lookups = site["memory_hits"] + site["disk_hits"] + site["misses"]
+                hits = lookups - site["misses"]
+                result[call_site] = dict(site, hit_rate=round(hits / lookups, 4) if lookups else 0.0)
+            return result
+
+    def generate(self, model, prompt: str, call_site: str, ttl: Optional[float] = None):
+        """model.generate_content(prompt) through the cache"""
+        key = self.key(model_name(model), prompt)
+        text = self.get(key, call_site)
+        if text is not None:
+            return CachedResponse(text)
+        with get_metrics().llm_call(call_site):
+            response = model.generate_content(prompt)
+        self.put(key, response.text, ttl)
+        return response
+
+    async def generate_async(self, model, prompt: str, call_site: str, ttl: Optional[float] = None):
+        """model.generate_content_async(prompt) through the cache, with the SQLite reads and writes off the event loop"""
+        key = self.key(model_name(model), prompt)
+        text = await asyncio.to_thread(self.get, key, call_site)
+        if text is not None:
+            return CachedResponse(text)
+        with get_metrics().llm_call(call_site):
+            response = await model.generate_content_async(prompt)
+        await asyncio.to_thread(self.put, key, response.text, ttl)
+        return response
+
+class NullCache:
+    """Drop-in for LLMCache when caching is switched off"""
+
+    def get(self, key: str, call_site: str = "default") -> Optional[str]:
+        return None
+
+    def put(self, key: str, text: str, ttl: Optional[float] = None):
+        pass
+
+    def stats(self) -> Dict[str, Dict]:
+        return {}
+
+    key = staticmethod(LLMCache.key)
+
+    def generate(self, model, prompt: str, call_site: str, ttl: Optional[float] = None):
+        with get_metrics().llm_call(call_site):
+            return model.generate_content(prompt)
+
+    async def generate_async(self, model, prompt: str, call_site: str, ttl: Optional[float] = None):
+        with get_metrics().llm_call(call_site):
+            return await model.generate_content_async(prompt)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_llm_cache():
+    """Process-wide response cache, configured from TALENTSCOUT_LLM_CACHE* variables"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            if os.getenv("TALENTSCOUT_LLM_CACHE", "1") == "1":
+                _cache = LLMCache(
+                    os.getenv("TALENTSCOUT_LLM_CACHE_DB", DEFAULT_CACHE_PATH),
+                    max_entries=int(os.getenv("TALENTSCOUT_LLM_CACHE_ENTRIES", "1000")),
+                    max_disk_bytes=int(os.getenv("TALENTSCOUT_LLM_CACHE_BYTES", str(50 * 1024 * 1024))),
+                    ttl=float(os.getenv("TALENTSCOUT_LLM_CACHE_TTL", str(24 * 3600))),
+                )
+            else:
+                _cache = NullCache()
+        return _cache
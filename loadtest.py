@@ -0,0 +1,199 @@
+# Load generator: drives many scripted candidate interviews at once through the interview turn logic
+import math
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from extraction import KNOWN_LOCATIONS, KNOWN_TECH
+from interview import InterviewSession
+
+FIRST_NAMES = ["Priya", "Arjun", "Meera", "Rahul", "Ananya", "Vikram", "Sara", "Daniel", "Aisha", "Lukas", "Mei", "Omar"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Khan", "Fischer", "Chen", "Okafor", "Novak", "Garcia"]
+POSITIONS = ["Backend Engineer", "Data Scientist", "Frontend Developer", "ML Engineer", "DevOps Engineer", "Full Stack Developer"]
+ANSWERS = [
+    "I would start by reading the documentation and writing a small example to check my understanding.",
+    "In my last project we handled that with careful error handling and a few integration tests around it.",
+    "The main difference is how they manage memory and mutability, which matters for performance.",
+    "I usually profile first, then fix the slowest part and measure again before changing anything else.",
+    "We used a queue between the services so a slow consumer never blocked the web requests.",
+]
+
+# A turn that fails is retried this many times before the session is abandoned
+TURN_RETRIES = 2
+
+# Turns after the scripted ones, answering follow-ups until the model ends the interview
+MAX_EXTRA_TURNS = 6
+
+def scripted_candidate(rng: random.Random) -> Dict:
+    """Random but plausible candidate profile"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    technologies = sorted(set(KNOWN_TECH.values()))
+    return {
+        "name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}{rng.randint(1, 999)}@example.com",
+        "phone": f"+91 9{rng.randint(100000000, 999999999)}",
+        "experience": f"{rng.randint(1, 12)} years",
+        "position": rng.choice(POSITIONS),
+        "location": rng.choice(sorted(set(KNOWN_LOCATIONS.values()))),
+        "tech_stack": rng.sample(technologies, rng.randint(1, 4)),
+    }
+
+def candidate_messages(profile: Dict, rng: random.Random) -> List[str]:
+    """The candidate's side of the interview: profile answers in the order the assistant asks, then answers"""
+    messages = [
+        profile["name"],
+        rng.choice(["{}", "My email is {}", "You can reach me at {}"]).format(profile["email"]),
+        profile["phone"],
+        rng.choice(["{}", "I have {} of experience", "About {} now"]).format(profile["experience"]),
+        profile["position"],
+        profile["location"],
+        ", ".join(profile["tech_stack"]),
+    ]
+    return messages + rng.sample(ANSWERS, 3)
+
+def timed_turn(stream, first_chunk_latencies: List[float]) -> float:
+    """Read a streamed turn to the end, noting when its first visible text arrived"""
+    started = time.perf_counter()
+    for i, _ in enumerate(stream):
+        if not i:
+            first_chunk_latencies.append(time.perf_counter() - started)
+    return time.perf_counter() - started
+
+def run_session(model, store, seed: int, mode: str = "single", stored_questions: bool = False, **options) -> Dict:
+    """Run one scripted interview to the end and return its timings
+
+    Without stored_questions, every session pays for the model generating its own.
+    """
+    rng = random.Random(seed)
+    messages = candidate_messages(scripted_candidate(rng), rng)
+    session = InterviewSession(model, f"loadtest-{seed}", turn_mode=mode, use_stored_questions=stored_questions, **options)
+    result = {"turn_latencies": [], "first_chunk_latencies": [], "save_latency": None, "errors": 0, "completed": False}
+
+    try:
+        timed_turn(session.stream_start(), result["first_chunk_latencies"])
+    except Exception:
+        result["errors"] += 1
+        return result
+
+    extra = [rng.choice(ANSWERS) for _ in range(MAX_EXTRA_TURNS)]
+    for message in messages + extra:
+        for _ in range(TURN_RETRIES + 1):
+            try:
+                result["turn_latencies"].append(timed_turn(session.stream_turn(message), result["first_chunk_latencies"]))
+            except Exception:
+                result["errors"] += 1
+                continue
+            break
+        else:
+            return result
+        if session.interview_complete:
+            break
+
+    started = time.perf_counter()
+    try:
+        session.finish(store)
+        result["save_latency"] = time.perf_counter() - started
+        result["completed"] = session.interview_complete
+    except Exception:
+        result["errors"] += 1
+    return result
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile, 0.0 for no values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def latency_summary(values: List[float]) -> Dict:
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(max(values, default=0.0) * 1000, 2),
+    }
+
+def run_level(model, store, sessions: int, concurrency: int, seed: int = 0, track_memory: bool = True, **options) -> Dict:
+    """Run sessions interviews with up to concurrency of them in flight and aggregate the results"""
+    executor = ThreadPoolExecutor(max_workers=concurrency) if options.get("mode") == "concurrent" else None
+    if track_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest") as pool:
+        results = list(pool.map(
+            lambda i: run_session(model, store, seed + i, executor=executor, **options),
+            range(sessions),
+        ))
+    elapsed = time.perf_counter() - started
+
+    peak = tracemalloc.get_traced_memory()[1] - baseline if track_memory else None
+    if executor:
+        executor.shutdown()
+
+    turns = [latency for result in results for latency in result["turn_latencies"]]
+    first_chunks = [latency for result in results for latency in result["first_chunk_latencies"]]
+    saves = [result["save_latency"] for result in results if result["save_latency"] is not None]
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "completed": sum(result["completed"] for result in results),
+        "errors": sum(result["errors"] for result in results),
+        "elapsed_seconds": round(elapsed, 3),
+        "turns_per_second": round(len(turns) / elapsed, 2) if elapsed else 0.0,
+        "sessions_per_minute": round(len(saves) / elapsed * 60, 2) if elapsed else 0.0,
+        "turn_latency": latency_summary(turns),
+        "first_chunk_latency": latency_summary(first_chunks),
+        "save_latency": latency_summary(saves),
+        # At most concurrency sessions are alive at once, so the peak is shared between them
+        "memory_per_session_kb": round(peak / min(concurrency, sessions) / 1024, 1) if peak is not None else None,
+    }
+
+def find_saturation(levels: List[Dict], min_gain: float = 0.1, slo_p95_ms: Optional[float] = None) -> Dict:
+    """Highest concurrency before throughput stops growing by min_gain or p95 breaks the SLO"""
+    best = None
+    for level in levels:
+        if slo_p95_ms is not None and level["turn_latency"]["p95_ms"] > slo_p95_ms:
+            return {"concurrency": best and best["concurrency"], "reason": f"p95 over {slo_p95_ms:g} ms at concurrency {level['concurrency']}"}
+        if best and level["turns_per_second"] < best["turns_per_second"] * (1 + min_gain):
+            return {"concurrency": best["concurrency"], "reason": f"throughput gain under {min_gain:.0%} at concurrency {level['concurrency']}"}
+        best = level
+    return {"concurrency": None, "reason": "not reached, try higher concurrency"}
+
+def run_load_test(model, store, sessions: int, concurrency_levels: List[int], seed: int = 0,
+                  min_gain: float = 0.1, slo_p95_ms: Optional[float] = None, report=None, **options) -> Dict:
+    """Run each concurrency level in turn and find the saturation point"""
+    levels = []
+    for concurrency in concurrency_levels:
+        level = run_level(model, store, sessions, concurrency, seed=seed, **options)
+        levels.append(level)
+        if report:
+            report(level)
+    return {
+        "options": dict(options, sessions=sessions, seed=seed),
+        "levels": levels,
+        "saturation": find_saturation(levels, min_gain, slo_p95_ms),
+    }
+
+def format_report(result: Dict) -> str:
+    """Text table of a run_load_test result"""
+    lines = [
+        f"{'conc':>5} {'turns/s':>9} {'sess/min':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ttfc p95':>9} {'save p95':>9} {'KB/sess':>8} {'errors':>7} {'done':>9}",
+    ]
+    for level in result["levels"]:
+        memory = "-" if level["memory_per_session_kb"] is None else f"{level['memory_per_session_kb']:.0f}"
+        lines.append(
+            f"{level['concurrency']:>5} {level['turns_per_second']:>9.2f} {level['sessions_per_minute']:>9.1f} "
+            f"{level['turn_latency']['p50_ms']:>9.1f} {level['turn_latency']['p95_ms']:>9.1f} {level['turn_latency']['p99_ms']:>9.1f} "
+            f"{level['first_chunk_latency']['p95_ms']:>9.1f} {level['save_latency']['p95_ms']:>9.1f} {memory:>8} "
+            f"{level['errors']:>7} {level['completed']:>4}/{level['sessions']:<4}"
+        )
+    saturation = result["saturation"]
+    lines.append(f"Saturation: {saturation['concurrency'] if saturation['concurrency'] is not None else '-'} ({saturation['reason']})")
+    return "\n".join(lines)
@@ -0,0 +1,176 @@
+# In-process metrics: per-stage turn timings and LLM call counters, exposed in Prometheus text format
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Call site of the LLM request in progress, for code that only sees the model call
+current_call_site: contextvars.ContextVar = contextvars.ContextVar("current_call_site", default="")
+
+# Session ids as a label give one series per interview, so they are opt-in, for debugging short runs
+SESSION_LABELS = os.getenv("TALENTSCOUT_METRICS_SESSION_LABELS", "0") == "1"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _label_text(names: Iterable[str], values: Iterable[str], le: Optional[str] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, as Prometheus expects"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        with self._lock:
+            series = self._series.setdefault(label_values, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_label_text(self.labels, label_values, format(bound, 'g'))} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, label_values, '+Inf')} {count}")
+                lines.append(f"{self.name}_sum{_label_text(self.labels, label_values)} {total:.6f}")
+                lines.append(f"{self.name}_count{_label_text(self.labels, label_values)} {count}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labels, label_values)} {value:g}")
+        return lines
+
+class Metrics:
+    """Every metric the app records, rendered together for the endpoint and the metrics file"""
+
+    def __init__(self):
+        self.stage_seconds = Histogram(
+            "talentscout_turn_stage_seconds",
+            "Time spent in each stage of an interview turn",
+            ("stage", "session"),
+        )
+        self.llm_calls = Counter("talentscout_llm_calls_total", "LLM requests sent, by call site", ("call_site",))
+        self.llm_errors = Counter("talentscout_llm_errors_total", "LLM requests that raised, by call site", ("call_site",))
+        self.errors = Counter("talentscout_errors_total", "Errors raised by a turn stage, or by the turn as a whole", ("stage",))
+        self.retries = Counter("talentscout_job_retries_total", "Background job attempts retried after a failure", ())
+
+    @contextmanager
+    def time_stage(self, stage: str, session: str = ""):
+        """Record how long the block takes under stage, counting it as an error if it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors.inc(stage)
+            raise
+        finally:
+            self.stage_seconds.observe(time.perf_counter() - started, stage, session if SESSION_LABELS else "")
+
+    @contextmanager
+    def llm_call(self, call_site: str):
+        """Count an LLM request and whether it raised"""
+        self.llm_calls.inc(call_site)
+        token = current_call_site.set(call_site)
+        try:
+            yield
+        except Exception:
+            self.llm_errors.inc(call_site)
+            raise
+        finally:
+            current_call_site.reset(token)
+
+    def render(self) -> str:
+        lines = []
+        for metric in (self.stage_seconds, self.llm_calls, self.llm_errors, self.errors, self.retries):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+def serve_metrics(metrics: Metrics, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve GET /metrics in Prometheus text format from a background thread"""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="talentscout-metrics").start()
+    return server
+
+def flush_metrics(metrics: Metrics, path: str, interval: float) -> threading.Thread:
+    """Rewrite path with the current metrics every interval seconds, for a node exporter textfile collector"""
+    def run():
+        while True:
+            time.sleep(interval)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(metrics.render())
+            os.replace(tmp_path, path)
+
+    thread = threading.Thread(target=run, daemon=True, name="talentscout-metrics-flush")
+    thread.start()
+    return thread
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> Metrics:
+    """Process-wide metrics, exported as TALENTSCOUT_METRICS_PORT and TALENTSCOUT_METRICS_FILE ask"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+            port = os.getenv("TALENTSCOUT_METRICS_PORT")
+            if port:
+                serve_metrics(_metrics, int(port))
+            path = os.getenv("TALENTSCOUT_METRICS_FILE")
+            if path:
+                flush_metrics(_metrics, path, float(os.getenv("TALENTSCOUT_METRICS_FLUSH_SECONDS", "15")))
+        return _metrics
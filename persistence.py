@@ -0,0 +1,32 @@
+# Cleaning and writing finished interviews to the candidates/ directory
+import json
+import os
+from datetime import datetime
+from typing import Dict
+
+CANDIDATES_DIR = "candidates"
+
+def clean_candidate_data(data: Dict) -> Dict:
+    """Copy of the candidate data with None values replaced by empty values"""
+    cleaned_data = data.copy()
+    for key in cleaned_data:
+        if cleaned_data[key] is None:
+            cleaned_data[key] = "" if key != "tech_stack" else []
+    return cleaned_data
+
+def candidate_filename(data: Dict) -> str:
+    """Timestamped, filesystem safe file name for a candidate's interview"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    name_part = data['name'].replace(' ', '_') if data['name'] else data['email'].split('@')[0] if data['email'] else 'unnamed'
+    filename = f"{name_part}_{timestamp}_interview.json"
+    return ''.join(c for c in filename if c.isalnum() or c in ['_', '-', '.'])
+
+def write_candidate_file(data: Dict, directory: str = CANDIDATES_DIR) -> str:
+    """Write cleaned candidate data as JSON and return the file name"""
+    filename = candidate_filename(data)
+    os.makedirs(directory, exist_ok=True)
+    
+    with open(os.path.join(directory, filename), 'w') as f:
+        json.dump(data, f, indent=4)
+    
+    return filename
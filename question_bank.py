@@ -0,0 +1,176 @@
+# Pre-generated technical questions per (technology, seniority band), stored in a memory-mapped file
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from extraction import KNOWN_TECH, parse_experience_years
+
+DEFAULT_BANK_PATH = "question_bank.bin"
+MAGIC = b"TSQB1\0"
+BANDS = ["junior", "mid", "senior"]
+
+GENERATION_PROMPT = """
+    Write {count} basic technical screening questions about {tech} for a {band} level candidate.
+    Each question should be one sentence, answerable in a few lines, and end with a question mark.
+
+    Format: Return only a JSON array of strings, nothing else.
+    """
+
+def seniority_band(experience) -> str:
+    """Seniority band for free-text experience, unknown counts as junior"""
+    years = parse_experience_years(experience)
+    if years is None or years < 2:
+        return "junior"
+    return "mid" if years < 5 else "senior"
+
+def normalize_tech(tech: str) -> str:
+    """Canonical lower-case name, so "python" and "Python" share questions"""
+    tech = tech.strip().lower()
+    return KNOWN_TECH.get(tech, tech).lower()
+
+def bank_key(tech: str, band: str) -> str:
+    return f"{normalize_tech(tech)}|{band}"
+
+def write_question_bank(questions: Dict[str, List[str]], path: str = DEFAULT_BANK_PATH):
+    """Write questions keyed by bank_key() as a header of offsets followed by a UTF-8 blob
+
+    Layout: MAGIC, little-endian uint32 header length, JSON header mapping each
+    key to [offset, length] pairs into the blob, then the blob itself.
+    """
+    blob = bytearray()
+    header = {}
+    for key, texts in sorted(questions.items()):
+        entries = []
+        for text in texts:
+            encoded = text.encode("utf-8")
+            entries.append([len(blob), len(encoded)])
+            blob += encoded
+        header[key] = entries
+
+    header_bytes = json.dumps(header, separators=(',', ':')).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+class QuestionBank:
+    """Read-only view of a question bank file
+
+    Only the small header is parsed at load time. Question texts are decoded from
+    the memory-mapped blob when they are looked up.
+    """
+
+    def __init__(self, path: str = DEFAULT_BANK_PATH):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a question bank file")
+        start = len(MAGIC) + 4
+        (header_length,) = struct.unpack("<I", self._mmap[len(MAGIC):start])
+        self._index = json.loads(self._mmap[start:start + header_length])
+        self._blob_start = start + header_length
+
+    def keys(self) -> List[str]:
+        return list(self._index)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._index.values())
+
+    def get(self, tech: str, band: str) -> List[str]:
+        entries = self._index.get(bank_key(tech, band), [])
+        return [self._mmap[self._blob_start + offset:self._blob_start + offset + length].decode("utf-8") for offset, length in entries]
+
+    def pick(self, tech_stack, experience, count: int = 3, seed: str = "") -> List[str]:
+        """count questions for a candidate, taken round-robin across their tech stack
+
+        Falls back to neighbouring bands when a tech has no questions for the
+        candidate's band. seed rotates the choice so candidates don't all get the
+        same questions.
+        """
+        if isinstance(tech_stack, str):
+            tech_stack = tech_stack.split(",")
+        band = seniority_band(experience)
+        fallback_bands = [band] + [other for other in BANDS if other != band]
+
+        pools = []
+        for tech in tech_stack or []:
+            for candidate_band in fallback_bands:
+                questions = self.get(tech, candidate_band)
+                if questions:
+                    rotation = sum(seed.encode()) % len(questions)
+                    pools.append(questions[rotation:] + questions[:rotation])
+                    break
+
+        picked = []
+        while pools and len(picked) < count:
+            for pool in list(pools):
+                if not pool:
+                    pools.remove(pool)
+                    continue
+                question = pool.pop(0)
+                if question not in picked:
+                    picked.append(question)
+                if len(picked) == count:
+                    break
+        return picked
+
+def parse_generated_questions(text: str) -> List[str]:
+    text = text.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+    try:
+        questions = json.loads(text)
+    except json.JSONDecodeError:
+        return []
+    if not isinstance(questions, list):
+        return []
+    return [" ".join(q.split()) for q in questions if isinstance(q, str) and q.strip().endswith("?")]
+
+def build_question_bank(model, technologies: Iterable[str], per_key: int = 5, bands: Iterable[str] = BANDS,
+                        path: str = DEFAULT_BANK_PATH, report=None) -> Dict[str, int]:
+    """Generate per_key questions for every (technology, band) with model and write the bank
+
+    Questions already in an existing bank at path are kept, so a failed run can
+    be repeated without paying for the keys it already generated.
+    """
+    questions: Dict[str, List[str]] = {}
+    if os.path.exists(path):
+        existing = QuestionBank(path)
+        questions = {key: existing.get(*key.split("|")) for key in existing.keys()}
+
+    bands = list(bands)
+    for tech in technologies:
+        for band in bands:
+            key = bank_key(tech, band)
+            if len(questions.get(key, [])) >= per_key:
+                continue
+            try:
+                response = model.generate_content(GENERATION_PROMPT.format(count=per_key, tech=tech, band=band))
+                generated = parse_generated_questions(response.text)
+            except Exception as e:
+                generated = []
+                if report:
+                    report(f"{key}: {str(e)}")
+            if generated:
+                questions[key] = generated[:per_key]
+            if report:
+                report(f"{key}: {len(questions.get(key, []))} questions")
+
+    write_question_bank(questions, path)
+    return {key: len(texts) for key, texts in questions.items()}
+
+_bank = None
+_bank_lock = threading.Lock()
+
+def get_question_bank() -> Optional[QuestionBank]:
+    """Process-wide question bank from TALENTSCOUT_QUESTION_BANK, None if there is no bank file"""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            path = os.getenv("TALENTSCOUT_QUESTION_BANK", DEFAULT_BANK_PATH)
+            _bank = QuestionBank(path) if os.path.exists(path) else False
+        return _bank or None
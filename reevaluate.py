@@ -0,0 +1,153 @@
+# Regenerates evaluation_summary for every stored candidate with bounded concurrency
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Dict, Optional, Set
+
+from evaluation import can_evaluate, evaluate_candidate_async, evaluate_candidates_packed_async
+
+DEFAULT_PROGRESS_FILE = "reevaluate_progress.jsonl"
+
+class RateLimiter:
+    """Spaces out request starts so no more than rpm begin in any minute"""
+
+    def __init__(self, rpm: float):
+        self.interval = 60.0 / rpm if rpm else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class ProgressLog:
+    """Append-only record of finished candidate ids so a killed run can resume"""
+
+    def __init__(self, path: str = DEFAULT_PROGRESS_FILE):
+        self.path = path
+
+    def done_ids(self) -> Set[str]:
+        if not os.path.exists(self.path):
+            return set()
+        done = set()
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["id"])
+                except (json.JSONDecodeError, KeyError):
+                    continue
+        return done
+
+    def mark_done(self, candidate_id: str):
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({"id": candidate_id}) + "\n")
+
+    def reset(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class Stats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.evaluated = 0
+        self.skipped = 0
+        self.errors = 0
+
+    def as_dict(self) -> Dict:
+        elapsed = time.monotonic() - self.started
+        attempted = self.evaluated + self.errors
+        return {
+            "evaluated": self.evaluated,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "elapsed_seconds": round(elapsed, 2),
+            "per_minute": round(self.evaluated / elapsed * 60, 2) if elapsed else 0.0,
+            "error_rate": round(self.errors / attempted, 4) if attempted else 0.0,
+        }
+
+async def reevaluate_all(store, model, concurrency: int = 4, rpm: float = 60, progress: Optional[ProgressLog] = None,
+                         report: Optional[Callable[[Dict], None]] = None, report_every: float = 10.0, pack: int = 1) -> Dict:
+    """Re-run the evaluation for every candidate in store and write the new summaries back
+
+    Candidates are streamed from the store into a bounded queue, so memory stays
+    flat however many there are. Finished ids go to the progress log, and ids
+    already in it are skipped. Failed candidates are left out of it, so a
+    re-run retries them. With pack > 1, up to pack candidates share one
+    evaluation request.
+    """
+    progress = progress or ProgressLog()
+    done = progress.done_ids()
+    limiter = RateLimiter(rpm)
+    stats = Stats()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def worker():
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                queue.task_done()
+                return
+            try:
+                if len(batch) == 1:
+                    candidate_id, data = batch[0]
+                    try:
+                        await limiter.acquire()
+                        summaries = {candidate_id: await evaluate_candidate_async(model, data)}
+                    except Exception:
+                        summaries = {}
+                else:
+                    summaries = await evaluate_candidates_packed_async(model, batch, limiter.acquire)
+
+                for candidate_id, _ in batch:
+                    if candidate_id not in summaries:
+                        stats.errors += 1
+                        continue
+                    try:
+                        await asyncio.to_thread(store.update_evaluation, candidate_id, summaries[candidate_id])
+                        await asyncio.to_thread(progress.mark_done, str(candidate_id))
+                        stats.evaluated += 1
+                    except Exception:
+                        stats.errors += 1
+            finally:
+                queue.task_done()
+
+    async def reporter():
+        while True:
+            await asyncio.sleep(report_every)
+            report(stats.as_dict())
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    reporter_task = asyncio.create_task(reporter()) if report else None
+
+    # Reading the store is blocking, pull one candidate at a time off the loop
+    candidates = iter(store.iter_candidates())
+    batch = []
+    while True:
+        item = await asyncio.to_thread(next, candidates, None)
+        if item is None:
+            break
+        candidate_id, data = item
+        if str(candidate_id) in done or not can_evaluate(data):
+            stats.skipped += 1
+            continue
+        batch.append((candidate_id, data))
+        if len(batch) >= pack:
+            await queue.put(batch)
+            batch = []
+    if batch:
+        await queue.put(batch)
+
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+    if reporter_task:
+        reporter_task.cancel()
+
+    return stats.as_dict()
@@ -0,0 +1,164 @@
+# Local similarity cache for tech-stack-dependent generations (questions, evaluation rubrics)
+import atexit
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from question_bank import BANDS, normalize_tech, seniority_band
+
+DEFAULT_CACHE_DIR = "semantic_cache"
+
+# How much the seniority band counts next to the tech terms
+BAND_WEIGHT = 0.75
+
+# Adds between writes of the cache files, the rest are written on flush or at exit
+SAVE_EVERY = int(os.getenv("TALENTSCOUT_SEMANTIC_CACHE_SAVE_EVERY", "10"))
+
+def tech_terms(tech_stack) -> List[str]:
+    """Normalized tech terms, so "python/langchain" and "LangChain + Python" agree"""
+    if isinstance(tech_stack, str):
+        tech_stack = re.split(r'[,/+&;]| and ', tech_stack)
+    terms = {normalize_tech(tech) for tech in tech_stack or [] if tech.strip()}
+    return sorted(terms)
+
+class SemanticCache:
+    """Cached payloads per kind, found by cosine similarity of tech stack vectors
+
+    Each entry is a multi-hot vector over the tech vocabulary seen so far, plus
+    a weighted one-hot seniority band, normalized to unit length. A lookup scores
+    every entry of a kind with one matrix-vector product and returns the best
+    payload if it reaches the threshold.
+    """
+
+    def __init__(self, directory: Optional[str] = DEFAULT_CACHE_DIR, threshold: float = 0.85, save_every: int = SAVE_EVERY):
+        self.directory = directory
+        self.threshold = threshold
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self.vocabulary: Dict[str, int] = {band: i for i, band in enumerate(BANDS)}
+        self._matrices: Dict[str, np.ndarray] = {}
+        self._payloads: Dict[str, List] = {}
+        self._load()
+
+    def _paths(self) -> Tuple[str, str]:
+        return os.path.join(self.directory, "vectors.npz"), os.path.join(self.directory, "entries.json")
+
+    def _load(self):
+        if not self.directory:
+            return
+        vectors_path, entries_path = self._paths()
+        if not (os.path.exists(vectors_path) and os.path.exists(entries_path)):
+            return
+        with open(entries_path) as f:
+            saved = json.load(f)
+        self.vocabulary = saved["vocabulary"]
+        self._payloads = saved["payloads"]
+        with np.load(vectors_path) as vectors:
+            self._matrices = {kind: vectors[kind] for kind in vectors.files}
+
+    def save(self):
+        """Write the cache files, replacing them whole so readers never see half of them"""
+        if not self.directory:
+            return
+        with self._lock:
+            # Matrices are replaced rather than changed in place, a shallow copy is a stable snapshot
+            matrices = dict(self._matrices)
+            entries = json.dumps({"vocabulary": self.vocabulary, "payloads": self._payloads})
+            self._unsaved = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        vectors_path, entries_path = self._paths()
+        with self._save_lock:
+            # Per-process names, so another process writing the same cache can't replace our files
+            vectors_tmp, entries_tmp = f"{vectors_path}.{os.getpid()}.tmp.npz", f"{entries_path}.{os.getpid()}.tmp"
+            np.savez(vectors_tmp, **matrices)
+            with open(entries_tmp, 'w') as f:
+                f.write(entries)
+            os.replace(vectors_tmp, vectors_path)
+            os.replace(entries_tmp, entries_path)
+
+    def flush(self):
+        """Write adds not saved yet"""
+        if self._unsaved:
+            self.save()
+
+    def _vector(self, tech_stack, experience, grow: bool) -> Optional[np.ndarray]:
+        terms = tech_terms(tech_stack)
+        if not terms:
+            return None
+        if grow:
+            for term in terms:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term in terms:
+            # Terms never seen before can't match anything, they only lower the score
+            index = self.vocabulary.get(term)
+            if index is not None:
+                vector[index] = 1.0
+        known = float(vector.sum())
+        vector[self.vocabulary[seniority_band(experience)]] = BAND_WEIGHT
+
+        # Normalize over every term, known or not, so unseen terms still count against the match
+        return vector / np.sqrt(len(terms) + BAND_WEIGHT ** 2) if known or grow else None
+
+    def lookup(self, kind: str, tech_stack, experience) -> Optional[object]:
+        """Best cached payload of kind for this stack and experience, or None below the threshold"""
+        with self._lock:
+            matrix = self._matrices.get(kind)
+            if matrix is None or not len(matrix):
+                return None
+            query = self._vector(tech_stack, experience, grow=False)
+            if query is None:
+                return None
+            scores = matrix @ query[:matrix.shape[1]]
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return self._payloads[kind][best]
+
+    def add(self, kind: str, tech_stack, experience, payload):
+        """Cache payload for this stack and experience"""
+        with self._lock:
+            vector = self._vector(tech_stack, experience, grow=True)
+            if vector is None:
+                return
+            matrix = self._matrices.get(kind, np.zeros((0, len(vector)), dtype=np.float32))
+            if matrix.shape[1] < len(vector):
+                # The vocabulary grew, older vectors get zero columns for the new terms
+                matrix = np.pad(matrix, ((0, 0), (0, len(vector) - matrix.shape[1])))
+
+            scores = matrix @ vector
+            if len(scores) and scores.max() > 0.999:
+                # Same stack and band as an existing entry, keep the newer payload
+                self._payloads[kind][int(np.argmax(scores))] = payload
+                self._matrices[kind] = matrix
+            else:
+                self._matrices[kind] = np.vstack([matrix, vector])
+                self._payloads.setdefault(kind, []).append(payload)
+            self._unsaved += 1
+            due = self._unsaved >= self.save_every
+
+        if due:
+            self.save()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_semantic_cache() -> SemanticCache:
+    """Process-wide semantic cache, stored in TALENTSCOUT_SEMANTIC_CACHE_DIR"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticCache(
+                os.getenv("TALENTSCOUT_SEMANTIC_CACHE_DIR", DEFAULT_CACHE_DIR),
+                threshold=float(os.getenv("TALENTSCOUT_SEMANTIC_CACHE_THRESHOLD", "0.85")),
+            )
+            atexit.register(_cache.flush)
+        return _cache
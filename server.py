@@ -0,0 +1,364 @@
+# ASGI server running interviews over REST and a WebSocket, many sessions per process
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+import clients
+from candidate import Message
+from checkpoint import CHECKPOINTS_DIR, CheckpointLog, take_mark, turn_delta
+from interview import BUDGET_MODEL, InterviewSession, TurnResult
+from jobs import DONE, FAILED, get_job_queue
+from metrics import get_metrics
+from token_ledger import MeteredModel, get_token_ledger
+
+# Sessions untouched for this long are dropped from memory, the session store may still have them
+SESSION_IDLE_SECONDS = float(os.getenv("TALENTSCOUT_SESSION_IDLE_SECONDS", "1800"))
+
+# Interviews held in memory at once, new ones are turned away beyond it
+MAX_SESSIONS = int(os.getenv("TALENTSCOUT_MAX_SESSIONS", "1000"))
+
+# How often a finished interview's save job is checked before its stored session is dropped
+SAVE_POLL_SECONDS = 1.0
+
+class MemorySessionStore:
+    """Keeps nothing outside the process, an evicted or restarted session is gone"""
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        return None
+
+    def record_turn(self, interview: InterviewSession, mark: Dict, messages: List[Message]):
+        pass
+
+    def delete(self, session_id: str):
+        pass
+
+    def forget(self, session_id: str):
+        pass
+
+class CheckpointSessionStore:
+    """Per-turn deltas in the checkpoint logs the Streamlit app uses, so sessions outlive eviction and restarts"""
+
+    def __init__(self, directory: str = CHECKPOINTS_DIR):
+        self.directory = directory
+        self._logs: Dict[str, CheckpointLog] = {}
+
+    def _log(self, session_id: str) -> CheckpointLog:
+        if session_id not in self._logs:
+            self._logs[session_id] = CheckpointLog(session_id, self.directory)
+        return self._logs[session_id]
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        state = self._log(session_id).load()
+        return state if state["messages"] else None
+
+    def record_turn(self, interview: InterviewSession, mark: Dict, messages: List[Message]):
+        log = self._log(interview.session_id)
+        log.append(turn_delta(mark, interview.candidate_data, [message.to_dict() for message in messages],
+                              interview.interview_complete, interview.save_job))
+        log.maybe_compact(interview.state)
+
+    def delete(self, session_id: str):
+        self._log(session_id).delete()
+        self._logs.pop(session_id, None)
+
+    def forget(self, session_id: str):
+        """Drop the open log of a session evicted from memory, its file stays"""
+        self._logs.pop(session_id, None)
+
+def get_session_store():
+    """Session store picked by TALENTSCOUT_SESSION_STORE, "memory" or "checkpoint" """
+    if os.getenv("TALENTSCOUT_SESSION_STORE", "memory") == "checkpoint":
+        return CheckpointSessionStore(os.getenv("TALENTSCOUT_CHECKPOINTS_DIR", CHECKPOINTS_DIR))
+    return MemorySessionStore()
+
+def new_interview(session_id: str) -> InterviewSession:
+    """Interview engine for session_id, metered into the token ledger"""
+    api_key = os.getenv("GEMINI_API_KEY", "")
+    ledger = get_token_ledger()
+    model = MeteredModel(clients.get_model(api_key), ledger, session_id)
+    budget_model = MeteredModel(clients.get_model(api_key, BUDGET_MODEL), ledger, session_id) if BUDGET_MODEL else None
+    return InterviewSession(model, session_id, ledger=ledger, budget_model=budget_model)
+
+class LiveSession:
+    """An interview held in memory, with the lock that keeps its turns in order"""
+
+    def __init__(self, interview: InterviewSession):
+        self.interview = interview
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+class SessionManager:
+    """Interviews in memory by session id, backed by a session store for ones that were evicted"""
+
+    def __init__(self, store=None, idle_seconds: float = SESSION_IDLE_SECONDS, max_sessions: int = MAX_SESSIONS):
+        self.store = store or MemorySessionStore()
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, LiveSession] = {}
+        self._restoring: Dict[str, asyncio.Task] = {}
+        self._cleanups = set()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self.idle_seconds
+        for session_id, live in list(self._sessions.items()):
+            if live.last_used < cutoff and not live.lock.locked():
+                del self._sessions[session_id]
+                self.store.forget(session_id)
+
+    def _add(self, interview: InterviewSession) -> LiveSession:
+        self._evict_idle()
+        if len(self._sessions) >= self.max_sessions:
+            raise OverflowError("Too many interviews in progress, try again later")
+        live = self._sessions[interview.session_id] = LiveSession(interview)
+        return live
+
+    async def start(self) -> LiveSession:
+        """New interview with its greeting sent"""
+        live = self._add(new_interview(uuid.uuid4().hex))
+        async with live.lock:
+            mark = take_mark(live.interview.candidate_data)
+            try:
+                await live.interview.start_async()
+            except Exception:
+                del self._sessions[live.interview.session_id]
+                raise
+            await asyncio.to_thread(self.store.record_turn, live.interview, mark, live.interview.messages[-1:])
+        return live
+
+    async def get(self, session_id: str) -> Optional[LiveSession]:
+        """The interview for session_id, brought back from the store if it was evicted
+
+        Requests for the same evicted session share one restore, so they all get
+        the same engine and lock. Raises OverflowError when memory is full.
+        """
+        live = self._sessions.get(session_id)
+        if live is None:
+            restoring = self._restoring.get(session_id)
+            if restoring is None:
+                restoring = self._restoring[session_id] = asyncio.ensure_future(self._restore(session_id))
+                restoring.add_done_callback(lambda _: self._restoring.pop(session_id, None))
+            # Shielded, so one caller going away doesn't cancel the restore for the others
+            live = await asyncio.shield(restoring)
+            if live is None:
+                return None
+        live.last_used = time.monotonic()
+        return live
+
+    async def _restore(self, session_id: str) -> Optional[LiveSession]:
+        try:
+            state = await asyncio.to_thread(self.store.load, session_id)
+        except ValueError:
+            return None
+        if state is None:
+            return None
+        interview = new_interview(session_id)
+        interview.restore(state["messages"], state["candidate_data"], state["interview_complete"], state["save_job"])
+        if interview.save_job != state["save_job"]:
+            # The save was queued again, the store keeps the new job in case of another restart
+            await asyncio.to_thread(self.store.record_turn, interview, take_mark(interview.candidate_data), [])
+        return self._add(interview)
+
+    async def turn(self, live: LiveSession, message: str, on_chunk=None) -> TurnResult:
+        """Run one candidate message, passing the visible reply to on_chunk as it streams"""
+        async with live.lock:
+            interview = live.interview
+            mark = take_mark(interview.candidate_data)
+            count = len(interview.messages)
+            try:
+                async for text in interview.stream_turn_async(message):
+                    if on_chunk:
+                        await on_chunk(text)
+            except Exception:
+                get_metrics().errors.inc("turn")
+                raise
+
+            turn = interview.last_turn
+            if turn.completed:
+                # Evaluation and saving run on the background job queue
+                interview.submit()
+            with get_metrics().time_stage("checkpoint", interview.session_id):
+                await asyncio.to_thread(self.store.record_turn, interview, mark, interview.messages[count:])
+            live.last_used = time.monotonic()
+            return turn
+
+    async def finish(self, live: LiveSession) -> str:
+        """Save the interview, ended or not, and drop it from memory, and from the store once it is saved
+
+        An interview already queued for saving keeps its job rather than being
+        saved twice. Until the job is done the store keeps the session, so one
+        lost to a restart or a failed job is queued again by finishing it again.
+        """
+        async with live.lock:
+            interview = live.interview
+            queued = interview.save_job
+            save_job = interview.submit()
+            if save_job != queued:
+                await asyncio.to_thread(self.store.record_turn, interview, take_mark(interview.candidate_data), [])
+            self._sessions.pop(interview.session_id, None)
+        cleanup = asyncio.create_task(self._delete_when_saved(interview.session_id, save_job))
+        self._cleanups.add(cleanup)
+        cleanup.add_done_callback(self._cleanups.discard)
+        return save_job
+
+    async def _delete_when_saved(self, session_id: str, job_id: str):
+        while True:
+            job = get_job_queue().status(job_id)
+            if job is None or job["status"] == FAILED:
+                return
+            if job["status"] == DONE:
+                await asyncio.to_thread(self.store.delete, session_id)
+                return
+            await asyncio.sleep(SAVE_POLL_SECONDS)
+
+def turn_payload(live: LiveSession, turn: TurnResult) -> Dict:
+    return {
+        "reply": turn.reply,
+        "questions": turn.questions,
+        "completed": live.interview.interview_complete,
+        "errors": turn.errors,
+        "save_job": live.interview.save_job,
+    }
+
+def error(status: int, message: str) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status)
+
+async def read_message(request: Request) -> Optional[str]:
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        return None
+    message = body.get("message") if isinstance(body, dict) else None
+    return message.strip() if isinstance(message, str) and message.strip() else None
+
+async def start_session(request: Request) -> JSONResponse:
+    manager: SessionManager = request.app.state.sessions
+    try:
+        live = await manager.start()
+    except OverflowError as e:
+        return error(503, str(e))
+    except Exception as e:
+        get_metrics().errors.inc("turn")
+        return error(502, f"Could not start the interview: {str(e)}")
+    return JSONResponse({"session_id": live.interview.session_id, "reply": live.interview.messages[-1].content}, status_code=201)
+
+async def get_session(request: Request) -> JSONResponse:
+    try:
+        live = await request.app.state.sessions.get(request.path_params["session_id"])
+    except OverflowError as e:
+        return error(503, str(e))
+    if live is None:
+        return error(404, "Unknown session")
+    return JSONResponse(dict(live.interview.state(), session_id=live.interview.session_id))
+
+async def post_turn(request: Request) -> JSONResponse:
+    manager: SessionManager = request.app.state.sessions
+    try:
+        live = await manager.get(request.path_params["session_id"])
+    except OverflowError as e:
+        return error(503, str(e))
+    if live is None:
+        return error(404, "Unknown session")
+    message = await read_message(request)
+    if message is None:
+        return error(400, 'Send a JSON body with a non-empty "message"')
+    try:
+        turn = await manager.turn(live, message)
+    except Exception as e:
+        return error(502, f"An error occurred: {str(e)}")
+    return JSONResponse(turn_payload(live, turn))
+
+async def finish_session(request: Request) -> JSONResponse:
+    manager: SessionManager = request.app.state.sessions
+    try:
+        live = await manager.get(request.path_params["session_id"])
+    except OverflowError as e:
+        return error(503, str(e))
+    if live is None:
+        return error(404, "Unknown session")
+    return JSONResponse({"save_job": await manager.finish(live)}, status_code=202)
+
+async def get_job(request: Request) -> JSONResponse:
+    job = get_job_queue().status(request.path_params["job_id"])
+    return JSONResponse(job) if job else error(404, "Unknown job")
+
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+async def health(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok", "sessions": len(request.app.state.sessions)})
+
+async def stream_session(websocket: WebSocket):
+    """Candidate messages in as {"message": ...}, the reply out as chunk frames then one turn frame"""
+    manager: SessionManager = websocket.app.state.sessions
+    try:
+        live = await manager.get(websocket.path_params["session_id"])
+    except OverflowError as e:
+        # 1013 is "try again later"
+        await websocket.close(code=1013, reason=str(e))
+        return
+    if live is None:
+        await websocket.close(code=4404, reason="Unknown session")
+        return
+    await websocket.accept()
+
+    async def send_chunk(text: str):
+        await websocket.send_json({"type": "chunk", "text": text})
+
+    try:
+        while True:
+            try:
+                body = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                body = None
+            message = body.get("message") if isinstance(body, dict) else None
+            if not isinstance(message, str) or not message.strip():
+                await websocket.send_json({"type": "error", "error": 'Send {"message": "..."}'})
+                continue
+            try:
+                turn = await manager.turn(live, message.strip(), send_chunk)
+            except Exception as e:
+                await websocket.send_json({"type": "error", "error": f"An error occurred: {str(e)}"})
+                continue
+            await websocket.send_json(dict(turn_payload(live, turn), type="turn"))
+    except WebSocketDisconnect:
+        pass
+
+def create_app(store=None) -> Starlette:
+    app = Starlette(routes=[
+        Route("/sessions", start_session, methods=["POST"]),
+        Route("/sessions/{session_id}", get_session, methods=["GET"]),
+        Route("/sessions/{session_id}/turns", post_turn, methods=["POST"]),
+        Route("/sessions/{session_id}/finish", finish_session, methods=["POST"]),
+        WebSocketRoute("/sessions/{session_id}/stream", stream_session),
+        Route("/jobs/{job_id}", get_job, methods=["GET"]),
+        Route("/metrics", metrics_endpoint, methods=["GET"]),
+        Route("/healthz", health, methods=["GET"]),
+    ])
+    app.state.sessions = SessionManager(store or get_session_store())
+    return app
+
+def serve(host: str = "127.0.0.1", port: int = 8000):
+    """Run the server with uvicorn, one process and event loop"""
+    import uvicorn
+
+    if clients.LLM_BACKEND == "gemini":
+        api_key = os.getenv("GEMINI_API_KEY", "")
+        if not api_key or not clients.validate_api_key(api_key):
+            sys.exit("Set GEMINI_API_KEY to a valid Gemini API key")
+    uvicorn.run(create_app(), host=host, port=port)
+
+if __name__ == "__main__":
+    serve(os.getenv("TALENTSCOUT_SERVER_HOST", "127.0.0.1"), int(os.getenv("TALENTSCOUT_SERVER_PORT", "8000")))
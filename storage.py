@@ -0,0 +1,274 @@
+# Candidate storage backends: JSON files in candidates/ or an indexed SQLite database
+import argparse
+import glob
+import json
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from extraction import parse_experience_years
+from persistence import CANDIDATES_DIR, write_candidate_file
+
+DEFAULT_DB_PATH = "candidates.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    phone TEXT NOT NULL DEFAULT '',
+    experience TEXT NOT NULL DEFAULT '',
+    experience_years REAL,
+    position TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL,
+    source TEXT UNIQUE
+);
+CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates(email);
+CREATE INDEX IF NOT EXISTS idx_candidates_phone ON candidates(phone);
+CREATE INDEX IF NOT EXISTS idx_candidates_position ON candidates(position COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_candidates_experience ON candidates(experience_years);
+CREATE INDEX IF NOT EXISTS idx_candidates_created_at ON candidates(created_at);
+
+CREATE TABLE IF NOT EXISTS candidate_tech (
+    tech TEXT NOT NULL,
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    label TEXT NOT NULL,
+    PRIMARY KEY (tech, candidate_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_candidate_tech_candidate ON candidate_tech(candidate_id);
+
+CREATE TABLE IF NOT EXISTS interview_qa (
+    candidate_id INTEGER NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT,
+    PRIMARY KEY (candidate_id, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS evaluations (
+    candidate_id INTEGER PRIMARY KEY REFERENCES candidates(id) ON DELETE CASCADE,
+    summary TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS token_usage (
+    candidate_id INTEGER PRIMARY KEY REFERENCES candidates(id) ON DELETE CASCADE,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    calls INTEGER NOT NULL
+);
+"""
+
+def tech_list(tech_stack) -> List[str]:
+    """Tech stack as a list, whichever shape it was stored in"""
+    if not tech_stack:
+        return []
+    if isinstance(tech_stack, str):
+        return [tech.strip() for tech in tech_stack.split(",") if tech.strip()]
+    return [str(tech).strip() for tech in tech_stack if str(tech).strip()]
+
+def timestamp_from_filename(path: str) -> str:
+    """Interview time from a *_YYYYMMDD_HHMMSS* file name, falling back to the file mtime"""
+    match = re.search(r'(\d{8}_\d{6})', os.path.basename(path))
+    if match:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").isoformat()
+    return datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+
+class JSONFileStore:
+    """One pretty-printed JSON file per interview in the candidates directory"""
+
+    def __init__(self, directory: str = CANDIDATES_DIR):
+        self.directory = directory
+
+    def save(self, data: Dict) -> str:
+        return write_candidate_file(data, self.directory)
+
+    def iter_candidates(self) -> Iterator[Tuple[str, Dict]]:
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.json"))):
+            with open(path) as f:
+                yield os.path.basename(path), json.load(f)
+
+    def update_evaluation(self, candidate_id: str, summary: str):
+        path = os.path.join(self.directory, candidate_id)
+        with open(path) as f:
+            data = json.load(f)
+        data["evaluation_summary"] = summary
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+
+class SQLiteCandidateStore:
+    """Candidates in SQLite (WAL mode) with indexed lookup columns and child tables"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _insert(self, conn: sqlite3.Connection, data: Dict, created_at: str, source: Optional[str] = None) -> int:
+        cursor = conn.execute(
+            """INSERT INTO candidates (name, email, phone, experience, experience_years, position, location, created_at, source)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                data.get("name") or "",
+                (data.get("email") or "").lower(),
+                data.get("phone") or "",
+                str(data.get("experience") or ""),
+                parse_experience_years(data.get("experience")),
+                data.get("position") or "",
+                data.get("location") or "",
+                created_at,
+                source,
+            ),
+        )
+        candidate_id = cursor.lastrowid
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO candidate_tech (tech, candidate_id, label) VALUES (?, ?, ?)",
+            [(tech.lower(), candidate_id, tech) for tech in tech_list(data.get("tech_stack"))],
+        )
+        interview = data.get("interview") or {}
+        questions = interview.get("questions") or []
+        answers = interview.get("answers") or []
+        conn.executemany(
+            "INSERT INTO interview_qa (candidate_id, seq, question, answer) VALUES (?, ?, ?, ?)",
+            [(candidate_id, seq, question, answers[seq] if seq < len(answers) else None) for seq, question in enumerate(questions)],
+        )
+        if data.get("evaluation_summary"):
+            conn.execute(
+                "INSERT INTO evaluations (candidate_id, summary, created_at) VALUES (?, ?, ?)",
+                (candidate_id, data["evaluation_summary"], created_at),
+            )
+        usage = data.get("token_usage")
+        if usage:
+            conn.execute(
+                "INSERT INTO token_usage (candidate_id, input_tokens, output_tokens, calls) VALUES (?, ?, ?, ?)",
+                (candidate_id, usage.get("input_tokens", 0), usage.get("output_tokens", 0), usage.get("calls", 0)),
+            )
+        return candidate_id
+
+    def save(self, data: Dict) -> str:
+        with closing(self._connect()) as conn, conn:
+            candidate_id = self._insert(conn, data, datetime.now().isoformat())
+        return f"candidate #{candidate_id}"
+
+    def update_evaluation(self, candidate_id: int, summary: str):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO evaluations (candidate_id, summary, created_at) VALUES (?, ?, ?)",
+                (candidate_id, summary, datetime.now().isoformat()),
+            )
+
+    def _load(self, conn: sqlite3.Connection, row: sqlite3.Row) -> Dict:
+        candidate_id = row["id"]
+        qa = conn.execute("SELECT question, answer FROM interview_qa WHERE candidate_id = ? ORDER BY seq", (candidate_id,)).fetchall()
+        evaluation = conn.execute("SELECT summary FROM evaluations WHERE candidate_id = ?", (candidate_id,)).fetchone()
+        tech = conn.execute("SELECT label FROM candidate_tech WHERE candidate_id = ? ORDER BY tech", (candidate_id,)).fetchall()
+        usage = conn.execute("SELECT input_tokens, output_tokens, calls FROM token_usage WHERE candidate_id = ?", (candidate_id,)).fetchone()
+        data = {
+            "name": row["name"],
+            "email": row["email"],
+            "phone": row["phone"],
+            "experience": row["experience"],
+            "position": row["position"],
+            "location": row["location"],
+            "tech_stack": [t["label"] for t in tech],
+            "interview": {
+                "questions": [q["question"] for q in qa],
+                "answers": [q["answer"] for q in qa if q["answer"] is not None],
+            },
+            "evaluation_summary": evaluation["summary"] if evaluation else "",
+        }
+        if usage:
+            data["token_usage"] = {
+                "input_tokens": usage["input_tokens"],
+                "output_tokens": usage["output_tokens"],
+                "total_tokens": usage["input_tokens"] + usage["output_tokens"],
+                "calls": usage["calls"],
+            }
+        return data
+
+    def get(self, candidate_id: int) -> Optional[Dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+            return self._load(conn, row) if row else None
+
+    def iter_candidates(self, batch: int = 200) -> Iterator[Tuple[int, Dict]]:
+        """All candidates in id order, read a page at a time on a fresh connection"""
+        last_id = 0
+        while True:
+            with closing(self._connect()) as conn:
+                rows = conn.execute("SELECT * FROM candidates WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch)).fetchall()
+                page = [(row["id"], self._load(conn, row)) for row in rows]
+            if not page:
+                return
+            yield from page
+            last_id = page[-1][0]
+
+    def search(self, email: str = None, phone: str = None, position: str = None, min_experience: float = None,
+               tech: List[str] = None, since: str = None, limit: int = 100) -> List[Dict]:
+        """Candidates matching every given filter, newest first"""
+        clauses, params = [], []
+        if email:
+            clauses.append("c.email = ?")
+            params.append(email.lower())
+        if phone:
+            clauses.append("c.phone = ?")
+            params.append(phone)
+        if position:
+            clauses.append("c.position = ? COLLATE NOCASE")
+            params.append(position)
+        if min_experience is not None:
+            clauses.append("c.experience_years >= ?")
+            params.append(min_experience)
+        if since:
+            clauses.append("c.created_at >= ?")
+            params.append(since)
+        for term in tech or []:
+            clauses.append("EXISTS (SELECT 1 FROM candidate_tech t WHERE t.tech = ? AND t.candidate_id = c.id)")
+            params.append(term.lower())
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT c.* FROM candidates c {where} ORDER BY c.created_at DESC LIMIT ?", (*params, limit)).fetchall()
+            return [dict(self._load(conn, row), id=row["id"], created_at=row["created_at"]) for row in rows]
+
+    def import_json_dir(self, directory: str = CANDIDATES_DIR) -> int:
+        """Bulk import interview JSON files in one transaction, skipping files already imported"""
+        imported = 0
+        with closing(self._connect()) as conn, conn:
+            known = {row[0] for row in conn.execute("SELECT source FROM candidates WHERE source IS NOT NULL")}
+            for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+                source = os.path.abspath(path)
+                if source in known:
+                    continue
+                with open(path) as f:
+                    data = json.load(f)
+                self._insert(conn, data, timestamp_from_filename(path), source)
+                imported += 1
+        return imported
+
+def get_store():
+    """Storage backend picked by TALENTSCOUT_STORAGE ("json" or "sqlite")"""
+    if os.getenv("TALENTSCOUT_STORAGE", "json") == "sqlite":
+        return SQLiteCandidateStore(os.getenv("TALENTSCOUT_DB", DEFAULT_DB_PATH))
+    return JSONFileStore()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import saved interview JSON files into the SQLite candidate store")
+    parser.add_argument("directory", nargs="?", default=CANDIDATES_DIR)
+    parser.add_argument("--db", default=os.getenv("TALENTSCOUT_DB", DEFAULT_DB_PATH))
+    args = parser.parse_args()
+    count = SQLiteCandidateStore(args.db).import_json_dir(args.directory)
+    print(f"Imported {count} candidate files into {args.db}")
@@ -0,0 +1,239 @@
+# Command line tools for working with saved interviews: python talentscout.py <command> --help
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+from benchmarks import DEFAULT_BASELINE_PATH, DEFAULT_THRESHOLD
+from candidate_index import CandidateIndex, split_terms
+from extraction import KNOWN_TECH
+from persistence import CANDIDATES_DIR
+from question_bank import BANDS, DEFAULT_BANK_PATH, build_question_bank
+from reevaluate import DEFAULT_PROGRESS_FILE, ProgressLog, reevaluate_all
+from storage import JSONFileStore, get_store
+
+def query_command(args):
+    index = CandidateIndex(args.directory)
+    index.refresh()
+
+    tech = [term for value in args.tech for term in split_terms(value)]
+    results = index.query(tech, args.position, args.location, args.min_experience, args.max_experience)
+
+    if args.json:
+        print(json.dumps(results[:args.limit], indent=2))
+        return
+
+    for doc in results[:args.limit]:
+        years = "?" if doc["experience_years"] is None else f"{doc['experience_years']:g}y"
+        print(f"{doc['name'] or doc['email'] or '-':<24} {years:>5}  {doc['position'] or '-':<24} {doc['location'] or '-':<14} {', '.join(doc['tech']) or '-'}  [{doc['file']}]")
+    print(f"{len(results)} matching candidate(s)", file=sys.stderr)
+
+def index_command(args):
+    changes = CandidateIndex(args.directory).refresh()
+    print(f"Index refreshed: {changes['added']} added, {changes['updated']} updated, {changes['removed']} removed, {changes['total']} total")
+
+def reevaluate_command(args):
+    # Imported here so the offline commands don't need google-generativeai
+    import clients
+
+    api_key = args.api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        sys.exit("Set GEMINI_API_KEY or pass --api-key")
+
+    progress = ProgressLog(args.progress)
+    if args.restart:
+        progress.reset()
+
+    def report(stats):
+        print(f"evaluated={stats['evaluated']} errors={stats['errors']} skipped={stats['skipped']} "
+              f"rate={stats['per_minute']}/min error_rate={stats['error_rate']:.1%}", file=sys.stderr)
+
+    stats = asyncio.run(reevaluate_all(
+        get_store(),
+        clients.get_model(api_key, args.model),
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        progress=progress,
+        report=report,
+        pack=args.pack,
+    ))
+    print(json.dumps(stats, indent=2))
+
+def build_question_bank_command(args):
+    import clients
+
+    api_key = args.api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        sys.exit("Set GEMINI_API_KEY or pass --api-key")
+
+    technologies = [term for value in args.tech for term in split_terms(value)] or sorted(set(KNOWN_TECH.values()))
+    counts = build_question_bank(
+        clients.get_model(api_key, args.model),
+        technologies,
+        per_key=args.per_key,
+        bands=args.band or BANDS,
+        path=args.output,
+        report=lambda line: print(line, file=sys.stderr),
+    )
+    print(f"Wrote {sum(counts.values())} questions for {len(counts)} (technology, band) pairs to {args.output}")
+
+def loadtest_command(args):
+    import loadtest
+
+    if not args.llm_cache:
+        # Scripted sessions repeat prompts, cached replies would flatter the numbers
+        os.environ["TALENTSCOUT_LLM_CACHE"] = "0"
+
+    if args.backend == "gemini":
+        import clients
+        api_key = args.api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            sys.exit("Set GEMINI_API_KEY or pass --api-key")
+        model = clients.get_model(api_key, args.model)
+    else:
+        import fake_llm
+        if args.backend == "http":
+            model = fake_llm.HTTPGenerativeModel(args.url)
+        else:
+            model = fake_llm.FakeGenerativeModel(latency=args.latency, error_rate=args.error_rate, seed=args.seed, chunk_delay=args.chunk_delay)
+
+    def report(level):
+        print(f"concurrency={level['concurrency']} turns/s={level['turns_per_second']} "
+              f"p95={level['turn_latency']['p95_ms']}ms errors={level['errors']}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as directory:
+        result = loadtest.run_load_test(
+            model,
+            get_store() if args.save else JSONFileStore(directory),
+            sessions=args.sessions,
+            concurrency_levels=[int(level) for level in args.concurrency.split(",")],
+            seed=args.seed,
+            min_gain=args.min_gain,
+            slo_p95_ms=args.slo_p95,
+            report=report,
+            mode=args.mode,
+            stream=not args.no_stream,
+            track_memory=not args.no_memory,
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    print(loadtest.format_report(result))
+
+def serve_command(args):
+    import server
+
+    if args.session_store:
+        os.environ["TALENTSCOUT_SESSION_STORE"] = args.session_store
+    server.serve(args.host, args.port)
+
+def benchmark_command(args):
+    import benchmarks
+
+    results = benchmarks.run_benchmarks(
+        args.filter,
+        min_time=args.min_time,
+        repeat=args.repeat,
+        report=lambda name, seconds: print(f"{name}: {benchmarks.format_duration(seconds)}", file=sys.stderr),
+    )
+    first_run = not os.path.exists(args.baseline)
+    rows = benchmarks.compare(results, benchmarks.load_baseline(args.baseline), args.threshold)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(benchmarks.format_comparison(rows))
+
+    # Timings only compare on the machine that recorded them, so the baseline
+    # is local (gitignored) and the first run on a host creates it
+    if args.save_baseline or first_run:
+        benchmarks.save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    elif any(row["status"] == "REGRESSION" for row in rows):
+        sys.exit(1)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="talentscout", description="TalentScout candidate tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser("query", help="Find saved candidates by tech stack, position, location and experience")
+    query.add_argument("--tech", action="append", default=[], help='Required tech, e.g. "Python + Langchain" (repeatable)')
+    query.add_argument("--position", help="Words that must appear in the position")
+    query.add_argument("--location", help="Candidate location")
+    query.add_argument("--min-experience", type=float, help="Minimum years of experience")
+    query.add_argument("--max-experience", type=float, help="Maximum years of experience")
+    query.add_argument("--limit", type=int, default=50)
+    query.add_argument("--json", action="store_true", help="Print matches as JSON")
+    query.add_argument("--directory", default=CANDIDATES_DIR)
+    query.set_defaults(func=query_command)
+
+    index = commands.add_parser("index", help="Build or refresh the candidate index")
+    index.add_argument("--directory", default=CANDIDATES_DIR)
+    index.set_defaults(func=index_command)
+
+    reevaluate = commands.add_parser("reevaluate", help="Regenerate evaluation_summary for every stored candidate")
+    reevaluate.add_argument("--concurrency", type=int, default=4, help="Evaluations in flight at once")
+    reevaluate.add_argument("--rpm", type=float, default=60, help="Maximum evaluation requests per minute (0 for no cap)")
+    reevaluate.add_argument("--pack", type=int, default=1, help="Candidates evaluated per request")
+    reevaluate.add_argument("--progress", default=DEFAULT_PROGRESS_FILE, help="Progress file used to resume a killed run")
+    reevaluate.add_argument("--restart", action="store_true", help="Ignore earlier progress and evaluate everyone again")
+    reevaluate.add_argument("--model", default="gemini-pro")
+    reevaluate.add_argument("--api-key", help="Gemini API key, defaults to GEMINI_API_KEY")
+    reevaluate.set_defaults(func=reevaluate_command)
+
+    bank = commands.add_parser("build-question-bank", help="Pre-generate technical questions per technology and seniority band")
+    bank.add_argument("--tech", action="append", default=[], help="Technologies to cover (repeatable), defaults to every known tech")
+    bank.add_argument("--band", action="append", choices=BANDS, help="Seniority bands to cover (repeatable), defaults to all")
+    bank.add_argument("--per-key", type=int, default=5, help="Questions per (technology, band)")
+    bank.add_argument("--output", default=DEFAULT_BANK_PATH)
+    bank.add_argument("--model", default="gemini-pro")
+    bank.add_argument("--api-key", help="Gemini API key, defaults to GEMINI_API_KEY")
+    bank.set_defaults(func=build_question_bank_command)
+
+    load = commands.add_parser("loadtest", help="Run many scripted interviews at once and report latency, throughput and memory")
+    load.add_argument("--backend", choices=["fake", "http", "gemini"], default="fake", help="fake runs in-process, http talks to a fake_llm.py server")
+    load.add_argument("--sessions", type=int, default=50, help="Interviews run at each concurrency level")
+    load.add_argument("--concurrency", default="1,2,4,8,16,32", help="Comma separated concurrency levels to step through")
+    load.add_argument("--mode", choices=["single", "serial", "concurrent"], default="single", help="Turn mode, as TALENTSCOUT_TURN_MODE")
+    load.add_argument("--no-stream", action="store_true", help="Request whole replies instead of streaming them")
+    load.add_argument("--latency", default="lognormal:-1.5,0.5", help="Fake backend latency distribution")
+    load.add_argument("--error-rate", type=float, default=0.0, help="Fake backend error rate")
+    load.add_argument("--chunk-delay", type=float, default=0.01, help="Fake backend seconds between streamed chunks")
+    load.add_argument("--url", default="http://127.0.0.1:8765", help="fake_llm.py server for the http backend")
+    load.add_argument("--slo-p95", type=float, help="Turn p95 in ms above which a level counts as saturated")
+    load.add_argument("--min-gain", type=float, default=0.1, help="Throughput gain below which a level counts as saturated")
+    load.add_argument("--no-memory", action="store_true", help="Skip tracemalloc, which slows every allocation")
+    load.add_argument("--llm-cache", action="store_true", help="Go through the LLM response cache as the app does")
+    load.add_argument("--save", action="store_true", help="Save interviews to the configured store instead of a temporary directory")
+    load.add_argument("--output", help="Write the full results as JSON to this file")
+    load.add_argument("--seed", type=int, default=0)
+    load.add_argument("--model", default="gemini-pro")
+    load.add_argument("--api-key", help="Gemini API key for the gemini backend, defaults to GEMINI_API_KEY")
+    load.set_defaults(func=loadtest_command)
+
+    bench = commands.add_parser("benchmark", help="Time the turn hot paths and compare them with this machine's baseline")
+    bench.add_argument("--filter", help="Only run benchmarks whose name matches this regex")
+    bench.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Per-machine timings, written by the first run if missing")
+    bench.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Slowdown counted as a regression, 0.2 is 20%%")
+    bench.add_argument("--save-baseline", action="store_true", help="Record these results as the new baseline instead of failing on regressions")
+    bench.add_argument("--min-time", type=float, default=0.2, help="Seconds each timing round runs for at least")
+    bench.add_argument("--repeat", type=int, default=5, help="Timing rounds per benchmark, the best one counts")
+    bench.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+    bench.set_defaults(func=benchmark_command)
+
+    serve = commands.add_parser("serve", help="Run interviews over REST and WebSocket from an ASGI server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--session-store", choices=["memory", "checkpoint"], help="Where sessions live besides memory, as TALENTSCOUT_SESSION_STORE")
+    serve.set_defaults(func=serve_command)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
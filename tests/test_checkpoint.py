@@ -0,0 +1,30 @@
+# Checkpoint log recovery after a write torn by a crash
+from checkpoint import CheckpointLog
+
+def turn(content: str) -> dict:
+    return {"type": "turn", "messages": [{"role": "user", "content": content}]}
+
+def test_append_after_torn_line_is_kept(tmp_path):
+    log = CheckpointLog("torn", str(tmp_path))
+    log.append(turn("first"))
+    with open(log.path, 'a') as f:
+        f.write('{"type":"turn","messages":[{"role":"user","con')
+
+    resumed = CheckpointLog("torn", str(tmp_path))
+    assert [m["content"] for m in resumed.load()["messages"]] == ["first"]
+    resumed.append(turn("second"))
+    resumed.append(turn("third"))
+
+    reloaded = CheckpointLog("torn", str(tmp_path)).load()
+    assert [m["content"] for m in reloaded["messages"]] == ["first", "second", "third"]
+
+def test_record_missing_its_newline_is_kept(tmp_path):
+    log = CheckpointLog("newline", str(tmp_path))
+    log.append(turn("first"))
+    with open(log.path, 'a') as f:
+        f.write('{"type":"turn","messages":[{"role":"user","content":"second"}]}')
+
+    resumed = CheckpointLog("newline", str(tmp_path))
+    assert len(resumed.load()["messages"]) == 2
+    resumed.append(turn("third"))
+    assert [m["content"] for m in CheckpointLog("newline", str(tmp_path)).load()["messages"]] == ["first", "second", "third"]
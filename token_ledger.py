@@ -0,0 +1,197 @@
+# Token accounting per session and per day, with budgets that switch a session to cheaper settings
+import asyncio
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date
+from typing import Dict, Optional
+
+from context_builder import estimate_tokens
+from history_manager import content_text
+from metrics import current_call_site
+
+DEFAULT_LEDGER_PATH = "token_ledger.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_usage (
+    day TEXT NOT NULL,
+    session TEXT NOT NULL,
+    call_site TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    calls INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, session, call_site)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_token_usage_session ON token_usage(session);
+"""
+
+def usage_tokens(response, prompt_text: str) -> tuple:
+    """(input, output) tokens from the response's usage metadata, estimated locally when it has none"""
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", 0) if usage else 0
+    output_tokens = getattr(usage, "candidates_token_count", 0) if usage else 0
+    if not prompt_tokens:
+        prompt_tokens = estimate_tokens(prompt_text)
+    if not output_tokens:
+        output_tokens = estimate_tokens(response.text) if response.text else 0
+    return prompt_tokens, output_tokens
+
+class TokenLedger:
+    """Input and output tokens per (day, session, call site) in SQLite
+
+    session_budget and daily_budget are total token limits, 0 for none. The
+    ledger only reports when one is used up, callers decide how to cut back.
+    """
+
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH, session_budget: int = 0, daily_budget: int = 0):
+        self.path = path
+        self.session_budget = session_budget
+        self.daily_budget = daily_budget
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def record(self, session: str, call_site: str, input_tokens: int, output_tokens: int):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """INSERT INTO token_usage (day, session, call_site, input_tokens, output_tokens, calls) VALUES (?, ?, ?, ?, ?, 1)
+                   ON CONFLICT (day, session, call_site) DO UPDATE SET
+                       input_tokens = input_tokens + excluded.input_tokens,
+                       output_tokens = output_tokens + excluded.output_tokens,
+                       calls = calls + 1""",
+                (date.today().isoformat(), session, call_site or "other", input_tokens, output_tokens),
+            )
+
+    def _totals(self, where: str, params: tuple) -> Dict:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT call_site, SUM(input_tokens), SUM(output_tokens), SUM(calls) FROM token_usage WHERE {where} GROUP BY call_site",
+                params,
+            ).fetchall()
+        by_site = {site: {"input_tokens": inp, "output_tokens": out, "calls": calls} for site, inp, out, calls in rows}
+        input_tokens = sum(site["input_tokens"] for site in by_site.values())
+        output_tokens = sum(site["output_tokens"] for site in by_site.values())
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "calls": sum(site["calls"] for site in by_site.values()),
+            "by_call_site": by_site,
+        }
+
+    def session_totals(self, session: str) -> Dict:
+        return self._totals("session = ?", (session,))
+
+    def day_totals(self, day: Optional[str] = None) -> Dict:
+        return self._totals("day = ?", (day or date.today().isoformat(),))
+
+    def over_budget(self, session: str) -> bool:
+        """Whether the session or today's total has used up its budget"""
+        if self.session_budget and self.session_totals(session)["total_tokens"] >= self.session_budget:
+            return True
+        return bool(self.daily_budget and self.day_totals()["total_tokens"] >= self.daily_budget)
+
+class MeteredResponse:
+    """Wraps a response so a streamed reply is recorded once it has been read to the end"""
+
+    def __init__(self, response, on_done):
+        self._response = response
+        self._on_done = on_done
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def __iter__(self):
+        yield from self._response
+        self._on_done(self._response)
+
+    async def __aiter__(self):
+        async for chunk in self._response:
+            yield chunk
+        # The ledger write is a blocking SQLite call, kept off the event loop
+        await asyncio.to_thread(self._on_done, self._response)
+
+class MeteredChat:
+    """ChatSession wrapper recording every send_message in the ledger"""
+
+    def __init__(self, chat, model: "MeteredModel"):
+        self._chat = chat
+        self.model = model
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+    def _prompt_text(self, message: str) -> str:
+        # Everything already in the history is sent again as input
+        return "".join(content_text(content) for content in self._chat.history) + message
+
+    def send_message(self, message: str, stream: bool = False):
+        prompt_text = self._prompt_text(message)
+        response = self._chat.send_message(message, stream=stream)
+        if stream:
+            return MeteredResponse(response, lambda done: self.model.charge(done, prompt_text, "chat"))
+        self.model.charge(response, prompt_text, "chat")
+        return response
+
+    async def send_message_async(self, message: str, stream: bool = False):
+        prompt_text = self._prompt_text(message)
+        response = await self._chat.send_message_async(message, stream=stream)
+        if stream:
+            return MeteredResponse(response, lambda done: self.model.charge(done, prompt_text, "chat"))
+        await asyncio.to_thread(self.model.charge, response, prompt_text, "chat")
+        return response
+
+class MeteredModel:
+    """GenerativeModel wrapper charging the tokens of every call to session in the ledger
+
+    Calls are recorded under the call site the metrics layer is timing, so the
+    ledger and the LLM call counters agree.
+    """
+
+    def __init__(self, model, ledger: TokenLedger, session: str):
+        self._model = model
+        self.ledger = ledger
+        self.session = session
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+    def charge(self, response, prompt_text: str, default_site: str = "generate"):
+        input_tokens, output_tokens = usage_tokens(response, prompt_text)
+        self.ledger.record(self.session, current_call_site.get() or default_site, input_tokens, output_tokens)
+
+    def generate_content(self, prompt: str, **kwargs):
+        response = self._model.generate_content(prompt, **kwargs)
+        if kwargs.get("stream"):
+            return MeteredResponse(response, lambda done: self.charge(done, prompt))
+        self.charge(response, prompt)
+        return response
+
+    async def generate_content_async(self, prompt: str, **kwargs):
+        response = await self._model.generate_content_async(prompt, **kwargs)
+        if kwargs.get("stream"):
+            return MeteredResponse(response, lambda done: self.charge(done, prompt))
+        await asyncio.to_thread(self.charge, response, prompt)
+        return response
+
+    def start_chat(self, history=None) -> MeteredChat:
+        return MeteredChat(self._model.start_chat(history=history), self)
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+def get_token_ledger() -> TokenLedger:
+    """Process-wide ledger, configured from TALENTSCOUT_TOKEN_* variables"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = TokenLedger(
+                os.getenv("TALENTSCOUT_TOKEN_LEDGER_DB", DEFAULT_LEDGER_PATH),
+                session_budget=int(os.getenv("TALENTSCOUT_SESSION_TOKEN_BUDGET", "0")),
+                daily_budget=int(os.getenv("TALENTSCOUT_DAILY_TOKEN_BUDGET", "0")),
+            )
+        return _ledger